@@ -0,0 +1,86 @@
+"""
+Đo thời gian tính bản đồ điểm kỳ vọng, tuần tự và qua process pool.
+
+    python -m benchmarks.aim_map --resolution 81 --samples 2000 --sigma 30
+
+Một vài điểm ngắm được tính lại bằng calculate_score từng cú ném để kiểm tra
+kết quả của bản vector hoá.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from utils import aim_map
+from utils.dart_scoring import DartScoring
+
+
+def brute_force_expected(calculator, x, y, sigma, rotations, samples, seed=1):
+    rng = random.Random(seed)
+    total = 0
+    for _ in range(samples):
+        score, _ = calculator.calculate_score(
+            x + rng.gauss(0, sigma),
+            y + rng.gauss(0, sigma),
+            rng.choice(rotations),
+            calculator.STANDARD_RADIUS,
+        )
+        total += score
+
+    return total / samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--resolution", type=int, default=81)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--sigma", type=float, default=30.0)
+    args = parser.parse_args()
+
+    calculator = DartScoring(
+        rings=[[95, 110, 3], [185, 200, 2]], bullseye_radius=16
+    )
+    spinning = list(range(0, 360, 10))
+    print(f"{os.cpu_count()} CPU, pool chỉ được dùng khi có nhiều hơn 1 CPU")
+
+    for rotation in (0.0, spinning):
+        for parallel in (False, True):
+            aim_map.clear_cache()
+            aim_map.PARALLEL_THRESHOLD = 0 if parallel else float("inf")
+
+            started = time.perf_counter()
+            result = aim_map.compute_aim_map(
+                calculator, args.sigma, rotation, args.resolution, args.samples
+            )
+            elapsed = time.perf_counter() - started
+
+            started = time.perf_counter()
+            aim_map.compute_aim_map(
+                calculator, args.sigma, rotation, args.resolution, args.samples
+            )
+            cached = time.perf_counter() - started
+
+            x, y, expected = result.best()
+            print(
+                f"rotation={'spin' if rotation is spinning else rotation:4} "
+                f"{'pool' if parallel else 'serial':6s} "
+                f"{elapsed * 1e3:8.1f}ms (cached {cached * 1e6:.0f}us) | "
+                f"best aim ({x:.0f}, {y:.0f}) -> {expected:.2f}"
+            )
+
+        rotations = [rotation] if rotation is not spinning else spinning
+        for i, j in ((0, 0), (args.resolution // 2, args.resolution // 3)):
+            reference = brute_force_expected(
+                calculator, result.xs[j], result.ys[i], args.sigma, rotations, 20000
+            )
+            print(
+                f"    aim ({result.xs[j]:.0f}, {result.ys[i]:.0f}): "
+                f"map {result.expected[i, j]:.2f}, brute force {reference:.2f}"
+            )
+
+    aim_map.shutdown()
+
+
+if __name__ == "__main__":
+    main()
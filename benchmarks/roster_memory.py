@@ -0,0 +1,184 @@
+"""
+So sánh roster dạng dict-of-dicts hiện tại với cách lưu theo cột.
+
+    python -m benchmarks.roster_memory --players 100000
+
+Cách lưu theo cột (`ColumnLayout`) chỉ có trong script này để đo, không được
+dùng trong app: PlayerTableModel vẫn cần dict cho từng người chơi, nên lưu
+thêm các cột làm tổng bộ nhớ tăng, còn lookup và build chậm hơn. Dòng
+"columnar + model" là bộ nhớ app thực sự phải giữ nếu RosterStore lưu theo cột.
+"""
+
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from array import array
+
+# Các cột stats, theo đúng khoá trong object người chơi của server
+INT_COLUMNS = ("totalMatches", "wins", "losses", "totalScore")
+
+
+class ColumnLayout:
+    """Username được intern, một dict username -> dòng, mỗi stats một mảng"""
+
+    def __init__(self, players) -> None:
+        self.usernames: list[str] = []
+        self.index: dict[str, int] = {}
+        self.columns = {key: array("q") for key in INT_COLUMNS}
+        # winRate có thể là int hoặc float (vd: 0 và 66.7), giữ nguyên object
+        self.win_rates: list = []
+
+        for player in players:
+            username = sys.intern(player["username"])
+            self.index[username] = len(self.usernames)
+            self.usernames.append(username)
+
+            for key, column in self.columns.items():
+                column.append(player.get(key, 0))
+            self.win_rates.append(player.get("winRate", 0))
+
+    def get(self, username: str) -> dict:
+        row = self.index[username]
+        player = {"username": self.usernames[row]}
+        for key, column in self.columns.items():
+            player[key] = column[row]
+        player["winRate"] = self.win_rates[row]
+
+        return player
+
+    def ranked(self) -> list[str]:
+        win_rates = self.win_rates
+        scores = self.columns["totalScore"]
+        usernames = self.usernames
+
+        rows = sorted(
+            range(len(usernames)),
+            key=lambda row: (-win_rates[row], -scores[row], usernames[row]),
+        )
+        return [usernames[row] for row in rows]
+
+    def filter_win_rate(self, minimum: float) -> list[str]:
+        return [
+            username
+            for username, win_rate in zip(self.usernames, self.win_rates)
+            if win_rate >= minimum
+        ]
+
+
+def make_players(count: int, seed: int = 0) -> list[dict]:
+    # Giống dữ liệu người chơi ảo của stub_server
+    rng = random.Random(seed)
+    players = []
+
+    for index in range(count):
+        matches = rng.randint(0, 200)
+        wins = rng.randint(0, matches)
+
+        players.append(
+            {
+                "username": f"bot_{index:06d}",
+                "totalMatches": matches,
+                "wins": wins,
+                "losses": matches - wins,
+                "totalScore": rng.randint(0, 50) * matches,
+                "winRate": round(wins * 100 / matches, 1) if matches else 0,
+            }
+        )
+
+    return players
+
+
+def measure(build) -> tuple[object, int, float]:
+    """Trả về (kết quả, số byte đã cấp phát còn giữ, thời gian build)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+
+    result = build()
+
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, size, elapsed
+
+
+def timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--players", type=int, default=100_000)
+    args = parser.parse_args()
+    count = args.players
+
+    # Dữ liệu vừa decode từ server, mỗi cách lưu giữ bản của riêng mình
+    source = make_players(count)
+
+    # RosterStore và PlayerTableModel dùng chung các dict người chơi
+    dicts, dict_bytes, dict_build = measure(
+        lambda: {player["username"]: dict(player) for player in source}
+    )
+    columns, column_bytes, column_build = measure(lambda: ColumnLayout(source))
+
+    # Lưu theo cột thì model vẫn phải dựng dict để hiển thị
+    _, model_bytes, model_build = measure(
+        lambda: [columns.get(username) for username in columns.usernames]
+    )
+
+    def row(name, size, build):
+        return (
+            f"{name:17s} {size / 2**20:7.1f} MiB "
+            f"({size / count:5.0f} B/player), build {build * 1000:.0f}ms"
+        )
+
+    print(f"players: {count}")
+    print(row("dict-of-dicts:", dict_bytes, dict_build))
+    print(row("columnar:", column_bytes, column_build))
+    print(
+        row(
+            "columnar + model:",
+            column_bytes + model_bytes,
+            column_build + model_build,
+        )
+    )
+
+    usernames = list(dicts)
+    random.Random(1).shuffle(usernames)
+
+    dict_lookup = timed(lambda: [dicts[username]["wins"] for username in usernames])
+    column_lookup = timed(
+        lambda: [columns.get(username)["wins"] for username in usernames]
+    )
+    print(
+        f"lookup: dict {dict_lookup * 1e9 / count:.0f}ns, "
+        f"columnar {column_lookup * 1e9 / count:.0f}ns per player"
+    )
+
+    dict_rank = timed(
+        lambda: sorted(
+            dicts.values(),
+            key=lambda p: (-p["winRate"], -p["totalScore"], p["username"]),
+        )
+    )
+    column_rank = timed(columns.ranked)
+    print(f"rank: dict {dict_rank * 1000:.0f}ms, columnar {column_rank * 1000:.0f}ms")
+
+    dict_filter = timed(
+        lambda: [p["username"] for p in dicts.values() if p["winRate"] >= 50]
+    )
+    column_filter = timed(lambda: columns.filter_win_rate(50))
+    print(
+        f"filter: dict {dict_filter * 1000:.0f}ms, "
+        f"columnar {column_filter * 1000:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Đo tốc độ tính điểm của DartScoring và đối chiếu với cách tính cũ.
+
+    python -m benchmarks.score_lookup --throws 200000
+
+Cách tính cũ (sqrt + duyệt tuyến tính segments) được chép nguyên văn trong
+`tests.baseline_scoring.BaselineCalculator`; script dừng với lỗi nếu hai cách
+cho kết quả khác nhau.
+Nếu có numpy, `calculate_scores` cũng được đối chiếu và đo tốc độ.
+"""
+
+import argparse
+import math
+import random
+import time
+
+from tests.baseline_scoring import is_on_boundary, make_reference
+from utils.dart_scoring import DartScoring
+
+
+def make_throws(count: int, max_radius: float, seed: int = 0) -> list[tuple]:
+    rng = random.Random(seed)
+    throws = [
+        (
+            rng.uniform(-1.1, 1.1) * max_radius,
+            rng.uniform(-1.1, 1.1) * max_radius,
+            rng.uniform(0, 720),
+        )
+        for _ in range(count)
+    ]
+
+    # Các điểm nằm đúng trên biên segment, nơi dễ sai lệch nhất
+    for boundary in range(0, 360, 6):
+        angle = math.radians(boundary)
+        throws.append((math.cos(angle) * 100, math.sin(angle) * 100, 0.0))
+
+    return throws
+
+
+def check_equivalence(calculator: DartScoring, throws, max_radius: float):
+    reference_score = make_reference(calculator)
+    for dx, dy, rotation in throws:
+        expected = reference_score(dx, dy, rotation, max_radius)
+        actual = calculator.calculate_score(dx, dy, rotation, max_radius)
+        if actual != expected:
+            raise AssertionError(
+                f"Khác kết quả tại dx={dx}, dy={dy}, rotation={rotation}: "
+                f"{actual} != {expected}"
+            )
+
+
+def check_batch_equivalence(calculator: DartScoring, throws, max_radius):
+    import numpy as np
+
+    dx, dy, rotation = (np.array(column) for column in zip(*throws))
+    scores, reasons = calculator.calculate_scores(dx, dy, rotation, max_radius)
+
+    boundary_mismatches = 0
+    for i, (x, y, angle) in enumerate(throws):
+        expected = calculator.calculate_score(x, y, angle, max_radius)
+        actual = (int(scores[i]), calculator.REASON_CODES[reasons[i]])
+        if actual == expected:
+            continue
+
+        if is_on_boundary(calculator, x, y, angle):
+            boundary_mismatches += 1
+        else:
+            raise AssertionError(
+                f"calculate_scores khác tại dx={x}, dy={y}, rotation={angle}: "
+                f"{actual} != {expected}"
+            )
+
+    started = time.perf_counter()
+    calculator.calculate_scores(dx, dy, rotation, max_radius)
+    return time.perf_counter() - started, boundary_mismatches
+
+
+def time_scoring(score, throws, max_radius: float) -> float:
+    started = time.perf_counter()
+    for dx, dy, rotation in throws:
+        score(dx, dy, rotation, max_radius)
+
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--throws", type=int, default=200_000)
+    args = parser.parse_args()
+
+    try:
+        import numpy  # noqa: F401
+
+        has_numpy = True
+    except ImportError:
+        print("[DEBUG] numpy chưa được cài, bỏ qua calculate_scores")
+        has_numpy = False
+
+    max_radius = 280.0
+    throws = make_throws(args.throws, max_radius)
+
+    layouts = {
+        "default": DartScoring(),
+        "rings": DartScoring(
+            rings=[[95, 110, 3], [185, 200, 2]], bullseye_radius=16
+        ),
+    }
+
+    for name, calculator in layouts.items():
+        check_equivalence(calculator, throws, max_radius)
+
+        reference = time_scoring(make_reference(calculator), throws, max_radius)
+        compiled = time_scoring(calculator.calculate_score, throws, max_radius)
+
+        line = (
+            f"{name:8s} equivalent on {len(throws)} throws | "
+            f"reference {reference * 1e9 / len(throws):5.0f}ns, "
+            f"compiled {compiled * 1e9 / len(throws):5.0f}ns"
+        )
+
+        if has_numpy:
+            batch, mismatches = check_batch_equivalence(
+                calculator, throws, max_radius
+            )
+            line += (
+                f", batch {batch * 1e9 / len(throws):5.1f}ns"
+                f" ({mismatches} boundary rounding diffs)"
+            )
+
+        print(line + " per throw")
+
+
+if __name__ == "__main__":
+    main()
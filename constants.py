@@ -4,3 +4,23 @@ WINDOW_HEIGHT = 650
 
 HOST = "localhost"
 PORT = 5000
+
+# Bật watchdog đo độ trễ GUI loop bằng biến môi trường DART_STALL_WATCHDOG=1
+STALL_WATCHDOG_ENV = "DART_STALL_WATCHDOG"
+STALL_THRESHOLD_MS = 100
+
+# Số người chơi mỗi trang khi tải lobby theo trang, 0 = tải cả danh sách
+LOBBY_PAGE_SIZE = 0
+
+# Thư mục lưu cache roster trên đĩa, để trống để tắt cache
+ROSTER_CACHE_DIR = "~/.dart_duel"
+
+# Ghép trận nhanh: số người chơi được thách đấu, thời gian chờ tổng (giây) và
+# thời gian chờ mỗi người khi server chưa hỗ trợ thách đấu cùng lúc
+QUICK_MATCH_CANDIDATES = 5
+QUICK_MATCH_TIMEOUT = 30
+QUICK_MATCH_CHALLENGE_TIMEOUT = 10
+
+# Lời thách đấu của ghép trận nhanh không huỷ được, lời thách đấu gửi tay và
+# lời chấp nhận chỉ được coi là còn hiệu lực trong chừng này giây
+QUICK_MATCH_PENDING_EXPIRY = 60
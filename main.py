@@ -1,4 +1,5 @@
 import asyncio
+import os
 import sys
 
 from PyQt5.QtWidgets import QApplication
@@ -6,6 +7,8 @@ from PyQt5.QtWidgets import QApplication
 from views import MainView
 from qasync import QEventLoop
 
+from constants import STALL_THRESHOLD_MS, STALL_WATCHDOG_ENV
+from utils.stall_watchdog import StallWatchdog
 from utils.tcp_client import TCPClient
 
 
@@ -13,11 +16,25 @@ async def main(app: QApplication):
     app_close_event = asyncio.Event()
     app.aboutToQuit.connect(app_close_event.set)
 
-    with TCPClient(("localhost", 5000)) as client:
-        view = MainView(client)
-        view.show()
+    watchdog = None
+    if os.environ.get(STALL_WATCHDOG_ENV):
+        watchdog = StallWatchdog(threshold=STALL_THRESHOLD_MS / 1000)
+        watchdog.start()
 
-        await app_close_event.wait()
+    try:
+        with TCPClient(("localhost", 5000)) as client:
+            view = MainView(client)
+            view.show()
+
+            await app_close_event.wait()
+
+            if client.roster_store is not None:
+                client.roster_store.close()
+
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
+            print(watchdog.report())
 
 
 if __name__ == "__main__":
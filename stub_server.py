@@ -0,0 +1,476 @@
+"""
+Server giả lập chạy local, dùng để thử và đo client khi không có server thật.
+
+Hỗ trợ đủ các command cơ bản của lobby (đăng ký, đăng nhập, danh sách online,
+thách đấu, trận đấu) và có thể tạo sẵn nhiều người chơi ảo để thử lobby lớn:
+
+    python stub_server.py --fake-players 50000
+
+Presence theo phiên bản (`subscribePresence` + event `presenceDelta`) có thể
+được thử trong điều kiện xấu bằng cách đảo thứ tự hoặc làm mất delta:
+
+    python stub_server.py --reorder-rate 0.2 --drop-rate 0.05
+
+Server thật có thể bỏ qua command nó không biết thay vì trả lỗi; giả lập
+bằng cách không trả lời một số command:
+
+    python stub_server.py --ignore-commands subscribePresence,checkUsername
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass, field
+
+from constants import HOST, PORT
+
+
+@dataclass
+class _Account:
+    username: str
+    password: str
+    wins: int = 0
+    losses: int = 0
+    total_score: int = 0
+
+    def to_player(self) -> dict:
+        total_matches = self.wins + self.losses
+        win_rate = round(self.wins * 100 / total_matches, 1) if total_matches else 0
+
+        return {
+            "username": self.username,
+            "totalMatches": total_matches,
+            "wins": self.wins,
+            "losses": self.losses,
+            "totalScore": self.total_score,
+            "winRate": win_rate,
+        }
+
+
+def _sort_key(player: dict, sort_by: str):
+    if sort_by == "rank":
+        return (player["winRate"], player["totalScore"])
+
+    return player[sort_by]
+
+
+# Số lượt ném của mỗi người chơi trong một trận, giống client
+THROWS_PER_PLAYER = 3
+
+
+@dataclass
+class _Session:
+    writer: asyncio.StreamWriter
+    username: str | None = None
+    # Đã đăng ký nhận presenceDelta
+    subscribed: bool = False
+    # Delta đang bị giữ lại để giả lập đảo thứ tự
+    held_delta: dict | None = None
+
+
+@dataclass
+class _Stream:
+    """Response gửi từng dòng `{"id", "row"}` rồi kết thúc bằng `body`"""
+
+    rows: list[dict]
+    body: dict = field(default_factory=dict)
+
+
+@dataclass
+class _Match:
+    players: tuple[str, str]
+    scores: dict[str, int] = field(default_factory=dict)
+    throws: dict[str, int] = field(default_factory=dict)
+
+    def opponent_of(self, username: str) -> str:
+        first, second = self.players
+        return second if username == first else first
+
+
+@dataclass
+class StubServer:
+    accounts: dict[str, _Account] = field(default_factory=dict)
+    # username -> session, người chơi ảo có session là None
+    online: dict[str, _Session | None] = field(default_factory=dict)
+    challenges: dict[int, tuple[str, str]] = field(default_factory=dict)
+    matches: dict[int, _Match] = field(default_factory=dict)
+    next_id: int = 1
+
+    # Version của presence, tăng 1 sau mỗi delta
+    presence_version: int = 0
+    reorder_rate: float = 0.0
+    drop_rate: float = 0.0
+    # Các command nhận được nhưng không bao giờ được trả lời
+    ignored_commands: frozenset[str] = frozenset()
+    rng: random.Random = field(default_factory=random.Random)
+
+    def add_fake_players(self, count: int, seed: int = 0):
+        rng = random.Random(seed)
+
+        for index in range(count):
+            username = f"bot_{index:06d}"
+            matches = rng.randint(0, 200)
+            wins = rng.randint(0, matches)
+
+            self.accounts[username] = _Account(
+                username=username,
+                password="password",
+                wins=wins,
+                losses=matches - wins,
+                total_score=rng.randint(0, 50) * matches,
+            )
+            self.online[username] = None
+
+    def _new_id(self) -> int:
+        self.next_id += 1
+        return self.next_id
+
+    async def _send(self, session: _Session | None, message: dict):
+        if session is None or session.writer.is_closing():
+            return
+
+        try:
+            session.writer.write(json.dumps(message).encode() + b"\n")
+            await session.writer.drain()
+        except ConnectionError:
+            # Client đã ngắt kết nối, phiên sẽ được dọn trong handle_client
+            pass
+
+    async def _broadcast(self, message: dict, exclude: str | None = None):
+        for username, session in list(self.online.items()):
+            if username != exclude:
+                await self._send(session, message)
+
+    async def _send_event(self, username: str, event: str, body):
+        await self._send(self.online.get(username), {"event": event, "body": body})
+
+    async def _publish_presence(self, op: str, player: dict):
+        """Gửi delta presence ("online", "offline", "update") cho các phiên đã đăng ký"""
+        self.presence_version += 1
+        delta = {
+            "event": "presenceDelta",
+            "body": {"seq": self.presence_version, "op": op, "player": player},
+        }
+
+        for session in list(self.online.values()):
+            if session is not None and session.subscribed:
+                await self._send_delta(session, delta)
+
+    async def _send_delta(self, session: _Session, delta: dict):
+        if self.rng.random() < self.drop_rate:
+            return
+
+        if session.held_delta is None and self.rng.random() < self.reorder_rate:
+            # Giữ delta này lại, gửi sau delta kế tiếp (hoặc sau một lúc)
+            session.held_delta = delta
+            asyncio.get_running_loop().call_later(
+                0.2, lambda: asyncio.ensure_future(self._release_held(session, delta))
+            )
+            return
+
+        await self._send(session, delta)
+        await self._release_held(session)
+
+    async def _release_held(self, session: _Session, delta: dict | None = None):
+        held = session.held_delta
+        if held is None or (delta is not None and held is not delta):
+            return
+
+        session.held_delta = None
+        await self._send(session, held)
+
+    async def handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        session = _Session(writer)
+
+        try:
+            async for line in reader:
+                if not line.strip():
+                    continue
+
+                request = json.loads(line)
+                if request.get("command") in self.ignored_commands:
+                    continue
+
+                try:
+                    body = await self.handle_request(session, request)
+                    response = {"ok": True, "body": body}
+                except ValueError as e:
+                    response = {"ok": False, "message": str(e)}
+
+                if response["ok"] and isinstance(body, _Stream):
+                    for row in body.rows:
+                        row = {"id": request.get("id"), "row": row}
+                        await self._send(session, row)
+                    response["body"] = body.body
+
+                response["id"] = request.get("id")
+                await self._send(session, response)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            if session.username is not None:
+                self.online.pop(session.username, None)
+                await self._broadcast({"event": "userOffline", "body": session.username})
+                await self._publish_presence("offline", {"username": session.username})
+
+            writer.close()
+
+    async def handle_request(self, session: _Session, request: dict):
+        command = request.get("command")
+        body = request.get("body") or {}
+
+        handler = getattr(self, f"_command_{command}", None)
+        if handler is None:
+            raise ValueError(f"Unknown command: {command}")
+
+        return await handler(session, body)
+
+    def _ranked_players(self) -> list[dict]:
+        """Người chơi online theo thứ hạng giảm dần, giống thứ tự của lobby"""
+        players = [self.accounts[username].to_player() for username in self.online]
+        players.sort(key=lambda player: player["username"])
+        players.sort(key=lambda player: _sort_key(player, "rank"), reverse=True)
+
+        return players
+
+    async def _command_register(self, session: _Session, body: dict):
+        username = body["username"]
+        if username in self.accounts:
+            raise ValueError("Username already exists")
+
+        self.accounts[username] = _Account(username, body["password"])
+
+    async def _command_checkUsername(self, session: _Session, body: dict):
+        return {"available": body["username"] not in self.accounts}
+
+    async def _command_login(self, session: _Session, body: dict):
+        account = self.accounts.get(body["username"])
+        if account is None:
+            raise ValueError("Account not found")
+
+        if account.password != body["password"]:
+            raise ValueError("Username or password does not match")
+
+        if self.online.get(account.username) is not None:
+            raise ValueError("Account is logged in from other session")
+
+        session.username = account.username
+        self.online[account.username] = session
+
+        await self._broadcast(
+            {"event": "newUserOnline", "body": account.username},
+            exclude=account.username,
+        )
+        await self._publish_presence("online", account.to_player())
+
+    async def _command_subscribePresence(self, session: _Session, body: dict):
+        session.subscribed = True
+
+        players = self._ranked_players()
+        if body.get("stream", False):
+            return _Stream(players, {"version": self.presence_version})
+
+        return {"version": self.presence_version, "players": players}
+
+    async def _command_listOnline(self, session: _Session, body: dict):
+        if body.pop("stream", False):
+            players = self._ranked_players()
+            return _Stream(players, {"total": len(players)})
+
+        players = [self.accounts[username].to_player() for username in self.online]
+
+        if not body:
+            return players
+
+        # Chế độ phân trang: {"offset", "limit", "sortBy", "descending", "username"}
+        username = body.get("username")
+        if username is not None:
+            players = [player for player in players if player["username"] == username]
+
+        sort_by = body.get("sortBy", "rank")
+        players.sort(key=lambda player: player["username"])
+        players.sort(
+            key=lambda player: _sort_key(player, sort_by),
+            reverse=body.get("descending", True),
+        )
+
+        offset = body.get("offset", 0)
+        limit = body.get("limit", len(players))
+
+        return {
+            "total": len(players),
+            "offset": offset,
+            "players": players[offset : offset + limit],
+        }
+
+    async def _command_challengePlayer(self, session: _Session, body: dict):
+        to = body["to"]
+        if to not in self.online:
+            raise ValueError("Player is not online")
+
+        challenge_id = self._new_id()
+        self.challenges[challenge_id] = (session.username, to)
+
+        await self._send_event(
+            to, "newChallenger", {"from": session.username, "challengeId": challenge_id}
+        )
+
+        return {"challengeId": challenge_id}
+
+    async def _command_cancelChallenge(self, session: _Session, body: dict):
+        challenge_id = body["challengeId"]
+
+        challenge = self.challenges.get(challenge_id)
+        if challenge is None or challenge[0] != session.username:
+            raise ValueError("Challenge not found")
+
+        del self.challenges[challenge_id]
+        await self._send_event(
+            challenge[1], "challengeCanceled", {"challengeId": challenge_id}
+        )
+
+    def _is_in_match(self, username: str) -> bool:
+        return any(username in match.players for match in self.matches.values())
+
+    async def _command_answerChallenge(self, session: _Session, body: dict):
+        challenge_id = body["challengeId"]
+        challenge = self.challenges.pop(challenge_id, None)
+        if challenge is None:
+            raise ValueError("Challenge not found")
+
+        challenger, _ = challenge
+        if body["newStatus"] != "accepted":
+            await self._send_event(
+                challenger, "challengeRejected", {"challengeId": challenge_id}
+            )
+            return
+
+        if self._is_in_match(challenger):
+            await self._send_event(
+                challenger, "challengeRejected", {"challengeId": challenge_id}
+            )
+            raise ValueError("Player is already in a match")
+
+        match_id = self._new_id()
+        self.matches[match_id] = _Match(challenge)
+
+        for username in challenge:
+            await self._send_event(
+                username, "startGame", {"id": match_id, "challengeId": challenge_id}
+            )
+
+    def _get_match(self, session: _Session, body: dict) -> _Match:
+        match = self.matches.get(body["matchId"])
+        if match is None or session.username not in match.players:
+            raise ValueError("Match not found")
+
+        return match
+
+    async def _finish_match(self, match_id: int, winner: str | None):
+        match = self.matches.pop(match_id)
+
+        for username in match.players:
+            account = self.accounts[username]
+            account.total_score += match.scores.get(username, 0)
+            if winner is None:
+                continue
+
+            if username == winner:
+                account.wins += 1
+            else:
+                account.losses += 1
+
+        for username in match.players:
+            await self._publish_presence("update", self.accounts[username].to_player())
+
+    async def _command_throw(self, session: _Session, body: dict):
+        match = self._get_match(session, body)
+        username = session.username
+
+        match.scores[username] = match.scores.get(username, 0) + body["score"]
+        match.throws[username] = match.throws.get(username, 0) + 1
+
+        throw = {key: value for key, value in body.items() if key != "matchId"}
+        await self._send_event(match.opponent_of(username), "otherThrew", throw)
+
+        if all(
+            match.throws.get(player, 0) >= THROWS_PER_PLAYER
+            for player in match.players
+        ):
+            first, second = match.players
+            first_score = match.scores.get(first, 0)
+            second_score = match.scores.get(second, 0)
+
+            winner = None
+            if first_score != second_score:
+                winner = first if first_score > second_score else second
+
+            await self._finish_match(body["matchId"], winner)
+
+    async def _command_forfeit(self, session: _Session, body: dict):
+        match = self._get_match(session, body)
+        opponent = match.opponent_of(session.username)
+
+        await self._send_event(
+            opponent, "playerForfeited", {"username": session.username}
+        )
+        await self._finish_match(body["matchId"], opponent)
+
+    async def _command_spin(self, session: _Session, body: dict):
+        match = self._get_match(session, body)
+
+        spin = {key: value for key, value in body.items() if key != "matchId"}
+        opponent = match.opponent_of(session.username)
+        await self._send_event(opponent, "opponentSpin", spin)
+
+
+async def _main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument(
+        "--fake-players",
+        type=int,
+        default=0,
+        help="Số người chơi ảo luôn online",
+    )
+    parser.add_argument(
+        "--reorder-rate",
+        type=float,
+        default=0.0,
+        help="Xác suất một presenceDelta bị gửi sau delta kế tiếp",
+    )
+    parser.add_argument(
+        "--drop-rate",
+        type=float,
+        default=0.0,
+        help="Xác suất một presenceDelta bị mất",
+    )
+    parser.add_argument(
+        "--ignore-commands",
+        default="",
+        help="Các command (cách nhau bởi dấu phẩy) không được trả lời",
+    )
+    args = parser.parse_args()
+
+    stub = StubServer(
+        reorder_rate=args.reorder_rate,
+        drop_rate=args.drop_rate,
+        ignored_commands=frozenset(filter(None, args.ignore_commands.split(","))),
+    )
+    stub.add_fake_players(args.fake_players)
+
+    server = await asyncio.start_server(stub.handle_client, args.host, args.port)
+    print(f"Stub server listening on {args.host}:{args.port}")
+
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,112 @@
+"""
+Cách tính điểm gốc (trước bảng tra cứu), dùng làm tham chiếu cho test và cho
+benchmarks/score_lookup.py.
+"""
+
+import math
+from itertools import accumulate
+from typing import List, Optional, Tuple
+
+from utils.dart_scoring import DartScoring
+
+
+class BaselineCalculator:
+    """
+    Bản sao nguyên văn phần tính điểm của DartScoreCalculator trước khi có
+    bảng tra cứu, bỏ phần phụ thuộc Qt.
+    """
+
+    DEFAULT_SEGMENTS = [list(segment) for segment in DartScoring.DEFAULT_SEGMENTS]
+
+    # Điểm số cho bullseye (tâm)
+    BULLSEYE_SCORE = 100
+
+    # Kích thước dartboard chuẩn để tính điểm (logic size)
+    STANDARD_RADIUS = 200.0
+
+    # Bán kính bullseye trên dartboard chuẩn (8% của STANDARD_RADIUS)
+    BULLSEYE_RADIUS = STANDARD_RADIUS * 0  # 16 pixels
+
+    def __init__(self, segments: Optional[List[List]] = None):
+        self.segments = segments if segments is not None else self.DEFAULT_SEGMENTS
+
+    def calculate_score(
+        self, dx: float, dy: float, rotation_angle: float, max_radius: float
+    ) -> Tuple[int, str]:
+        # Normalize tọa độ về dartboard chuẩn để tính điểm nhất quán
+        # Scale factor: chuyển từ kích thước hiện tại về kích thước chuẩn
+        scale_factor = self.STANDARD_RADIUS / max_radius
+        dx_normalized = dx * scale_factor
+        dy_normalized = dy * scale_factor
+
+        # Tính khoảng cách từ tâm trên dartboard chuẩn
+        distance_from_center = math.sqrt(dx_normalized**2 + dy_normalized**2)
+
+        # 1. Kiểm tra Bullseye (tâm)
+        if distance_from_center < self.BULLSEYE_RADIUS:
+            return self.BULLSEYE_SCORE, "bullseye"
+
+        # 2. Kiểm tra xem có trượt không (ngoài bảng)
+        if distance_from_center > self.STANDARD_RADIUS:
+            return 0, "miss"
+
+        # 3. Xác định segment dựa trên góc
+        angle_rad = math.atan2(dy_normalized, dx_normalized)
+        angle_deg = math.degrees(angle_rad)
+
+        # Chuyển từ [-180, 180] sang [0, 360]
+        if angle_deg < 0:
+            angle_deg += 360
+
+        # Điều chỉnh góc theo rotation hiện tại của dartboard
+        adjusted_angle = (angle_deg - (rotation_angle % 360)) % 360
+
+        # Tìm segment tương ứng và lấy điểm
+        base_score = self._get_segment_score(adjusted_angle)
+
+        return base_score, "segment"
+
+    def _get_segment_score(self, angle: float) -> int:
+        current_angle = 0
+        for score, angle_width, _ in self.segments:
+            if current_angle <= angle < current_angle + angle_width:
+                return score
+            current_angle += angle_width
+
+        # Fallback - trường hợp góc 360 (do floating point)
+        return self.segments[0][0]
+
+
+def make_reference(calculator: DartScoring):
+    """
+    Hàm tính điểm tham chiếu cho layout của `calculator`: cách tính gốc, cộng
+    thêm vòng nhân điểm vì cách tính gốc không có vòng. Hệ số của vòng chứa
+    khoảng cách tới tâm (inner <= d < outer) được nhân vào sau.
+    """
+    baseline = BaselineCalculator([list(segment) for segment in calculator.segments])
+    baseline.BULLSEYE_RADIUS = calculator.bullseye_radius
+    if not calculator.rings:
+        return baseline.calculate_score
+
+    def reference_score(dx, dy, rotation_angle, max_radius) -> Tuple[int, str]:
+        score, reason = baseline.calculate_score(dx, dy, rotation_angle, max_radius)
+        if reason != "segment":
+            return score, reason
+
+        scale_factor = baseline.STANDARD_RADIUS / max_radius
+        distance = math.hypot(dx * scale_factor, dy * scale_factor)
+        for inner, outer, multiplier in calculator.rings:
+            if inner <= distance < outer:
+                reason = calculator.RING_REASONS.get(multiplier, "ring")
+                return score * multiplier, reason
+
+        return score, reason
+
+    return reference_score
+
+
+def is_on_boundary(calculator: DartScoring, dx, dy, rotation) -> bool:
+    # arctan2 của numpy có thể lệch 1 ULP so với math.atan2 ngay trên biên
+    angle = (math.degrees(math.atan2(dy, dx)) - rotation) % 360
+    bounds = [0, *accumulate(seg[1] for seg in calculator.segments)]
+    return any(math.isclose(angle, bound, abs_tol=1e-9) for bound in bounds)
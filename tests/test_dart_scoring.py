@@ -0,0 +1,220 @@
+"""
+Đối chiếu DartScoring với cách tính điểm gốc (trước bảng tra cứu), bản sao
+nguyên văn nằm trong tests/baseline_scoring.py, và calculate_scores với
+calculate_score (bỏ qua nếu chưa cài numpy).
+
+    python -m unittest discover tests
+"""
+
+import math
+import unittest
+from itertools import accumulate
+
+from tests.baseline_scoring import (
+    BaselineCalculator,
+    is_on_boundary,
+    make_reference,
+)
+from utils.dart_scoring import DartScoring
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def around(value: float):
+    """Giá trị và hai số float liền kề"""
+    return math.nextafter(value, -math.inf), value, math.nextafter(value, math.inf)
+
+
+def boundary_points(segments, radii, rotation: float):
+    """Các điểm nằm đúng trên (và sát) biên segment và biên bán kính"""
+    bounds = [0, *accumulate(segment[1] for segment in segments)]
+
+    for bound in bounds:
+        for angle in around(math.radians(bound + rotation)):
+            for radius in (50.0, 150.0, 199.99):
+                yield math.cos(angle) * radius, math.sin(angle) * radius
+
+    # Trên các trục và trên tam giác 3-4-5, khoảng cách tới tâm là số chính xác
+    for radius in radii:
+        for r in around(radius):
+            yield r, 0.0
+            yield 0.0, -r
+            yield -r, 0.0
+        yield radius * 0.6, radius * 0.8
+        yield -radius * 0.8, radius * 0.6
+
+
+def grid_throws(max_radius: float):
+    """Lưới điểm phủ cả dartboard và một phần bên ngoài"""
+    step = max_radius / 40
+    for i in range(-46, 47):
+        for j in range(-46, 47):
+            yield i * step, j * step
+
+
+class DartScoringTest(unittest.TestCase):
+    ROTATIONS = (0.0, 17.5, 36.0, 90.0, 359.9, -45.0, 733.0)
+    MAX_RADII = (200.0, 280.0, 123.4)
+
+    def assert_same_scores(self, expected_score, calculator, throws, rotation, radius):
+        for dx, dy in throws:
+            with self.subTest(dx=dx, dy=dy, rotation=rotation, max_radius=radius):
+                self.assertEqual(
+                    calculator.calculate_score(dx, dy, rotation, radius),
+                    expected_score(dx, dy, rotation, radius),
+                )
+
+    def test_default_layout_matches_baseline(self):
+        calculator = DartScoring()
+        baseline = BaselineCalculator()
+
+        for radius in self.MAX_RADII:
+            for rotation in self.ROTATIONS:
+                self.assert_same_scores(
+                    baseline.calculate_score,
+                    calculator,
+                    grid_throws(radius),
+                    rotation,
+                    radius,
+                )
+
+        # Biên được tính trên dartboard chuẩn nên chỉ cần max_radius chuẩn
+        radius = DartScoring.STANDARD_RADIUS
+        for rotation in self.ROTATIONS:
+            self.assert_same_scores(
+                baseline.calculate_score,
+                calculator,
+                boundary_points(calculator.segments, [radius], rotation),
+                rotation,
+                radius,
+            )
+
+    def test_uneven_segments_match_baseline(self):
+        segments = [[3, 10.5, None], [7, 100, None], [2, 0.5, None], [9, 249, None]]
+        calculator = DartScoring(segments=segments)
+        baseline = BaselineCalculator(segments)
+
+        for rotation in self.ROTATIONS:
+            self.assert_same_scores(
+                baseline.calculate_score,
+                calculator,
+                [
+                    *grid_throws(200.0),
+                    *boundary_points(segments, [200.0], rotation),
+                ],
+                rotation,
+                200.0,
+            )
+
+    def test_rings_and_bullseye_match_baseline(self):
+        rings = [[95, 110, 3], [185, 200, 2]]
+        calculator = DartScoring(rings=rings, bullseye_radius=16)
+        expected_score = make_reference(calculator)
+
+        radii = [16, 95, 110, 185, 200]
+        for rotation in self.ROTATIONS:
+            self.assert_same_scores(
+                expected_score,
+                calculator,
+                [
+                    *grid_throws(200.0),
+                    *boundary_points(calculator.segments, radii, rotation),
+                ],
+                rotation,
+                200.0,
+            )
+
+    def test_adjacent_rings(self):
+        # Vòng ngoài bắt đầu đúng nơi vòng trong kết thúc
+        rings = [[100, 120, 2], [120, 140, 3]]
+        calculator = DartScoring(rings=rings)
+        expected_score = make_reference(calculator)
+
+        self.assert_same_scores(
+            expected_score,
+            calculator,
+            boundary_points(calculator.segments, [100, 120, 140], 0.0),
+            0.0,
+            200.0,
+        )
+
+    def test_get_segments_returns_lists(self):
+        segments = DartScoring().get_segments()
+
+        self.assertIsInstance(segments, list)
+        self.assertTrue(all(isinstance(segment, list) for segment in segments))
+        self.assertEqual(
+            segments, [list(segment) for segment in DartScoring.DEFAULT_SEGMENTS]
+        )
+
+
+@unittest.skipUnless(np is not None, "calculate_scores cần numpy")
+class CalculateScoresTest(unittest.TestCase):
+    LAYOUTS = {
+        "default": {},
+        "uneven": {
+            "segments": [
+                [3, 10.5, None],
+                [7, 100, None],
+                [2, 0.5, None],
+                [9, 249, None],
+            ]
+        },
+        "rings": {"rings": [[95, 110, 3], [185, 200, 2]], "bullseye_radius": 16},
+    }
+
+    def assert_batch_matches(self, calculator, throws, rotations, max_radius):
+        """
+        calculate_scores phải giống calculate_score cho từng cú ném, trừ các
+        điểm nằm đúng trên biên segment (arctan2 của numpy làm tròn khác).
+        """
+        dx, dy = (np.array(column) for column in zip(*throws))
+        scores, reasons = calculator.calculate_scores(
+            dx, dy, np.array(rotations), max_radius
+        )
+
+        for i, ((x, y), rotation) in enumerate(zip(throws, rotations)):
+            expected = calculator.calculate_score(x, y, rotation, max_radius)
+            actual = (int(scores[i]), calculator.REASON_CODES[reasons[i]])
+            if actual == expected or is_on_boundary(calculator, x, y, rotation):
+                continue
+
+            with self.subTest(dx=x, dy=y, rotation=rotation, max_radius=max_radius):
+                self.assertEqual(actual, expected)
+
+    def test_batch_matches_single_throws(self):
+        radius = DartScoring.STANDARD_RADIUS
+
+        for name, layout in self.LAYOUTS.items():
+            calculator = DartScoring(**layout)
+            radii = [calculator.bullseye_radius, radius]
+            radii += [bound for ring in calculator.rings for bound in ring[:2]]
+
+            for rotation in DartScoringTest.ROTATIONS:
+                throws = [
+                    *grid_throws(radius),
+                    *boundary_points(calculator.segments, radii, rotation),
+                ]
+                with self.subTest(layout=name, rotation=rotation):
+                    self.assert_batch_matches(
+                        calculator, throws, [rotation] * len(throws), radius
+                    )
+
+    def test_rotation_per_throw(self):
+        calculator = DartScoring()
+        rotations = DartScoringTest.ROTATIONS
+
+        for radius in DartScoringTest.MAX_RADII:
+            throws = list(grid_throws(radius))
+            self.assert_batch_matches(
+                calculator,
+                throws,
+                [rotations[i % len(rotations)] for i in range(len(throws))],
+                radius,
+            )
+
+if __name__ == "__main__":
+    unittest.main()
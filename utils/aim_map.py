@@ -0,0 +1,200 @@
+import multiprocessing
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Sequence
+
+from .dart_scoring import DartScoring
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Số điểm ngắm mỗi lần gọi calculate_scores, giới hạn bộ nhớ của mảng tạm
+CHUNK_POINTS = 256
+
+# Dưới ngưỡng này (điểm ngắm x số mẫu) tính ngay trong process hiện tại,
+# khởi động worker còn tốn hơn tự tính
+PARALLEL_THRESHOLD = 2_000_000
+
+CACHE_SIZE = 16
+
+# (điểm và góc của từng segment, các vòng, bán kính bullseye)
+type Layout = tuple[tuple[tuple[int, float], ...], tuple[tuple, ...], float]
+
+_cache: OrderedDict[tuple, "AimMap"] = OrderedDict()
+_pool: ProcessPoolExecutor | None = None
+
+
+def _import_numpy():
+    # Import khi cần để app và worker không phải tải numpy lúc khởi động
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("aim_map cần cài đặt numpy (xem requirement.txt)") from e
+
+    return np
+
+
+@dataclass(frozen=True)
+class AimMap:
+    """
+    Điểm kỳ vọng khi ngắm vào từng điểm của lưới, toạ độ trên dartboard chuẩn
+    (tâm ở 0, bán kính STANDARD_RADIUS). `expected[i][j]` ứng với điểm ngắm
+    (xs[j], ys[i]).
+    """
+
+    xs: "np.ndarray"
+    ys: "np.ndarray"
+    expected: "np.ndarray"
+
+    def best(self) -> tuple[float, float, float]:
+        """
+        Returns:
+            Tuple (x, y, expected) của điểm ngắm có điểm kỳ vọng cao nhất
+        """
+        np = _import_numpy()
+
+        i, j = np.unravel_index(np.argmax(self.expected), self.expected.shape)
+        return float(self.xs[j]), float(self.ys[i]), float(self.expected[i, j])
+
+
+def layout_of(calculator: DartScoring) -> Layout:
+    """Phần của calculator ảnh hưởng tới điểm số, bỏ qua màu"""
+    return (
+        tuple((score, angle_width) for score, angle_width, _ in calculator.segments),
+        tuple(tuple(ring) for ring in sorted(calculator.rings)),
+        calculator.bullseye_radius,
+    )
+
+
+def _calculator_for(layout: Layout) -> DartScoring:
+    segments, rings, bullseye_radius = layout
+    return DartScoring(
+        segments=[[score, angle_width, None] for score, angle_width in segments],
+        rings=[list(ring) for ring in rings],
+        bullseye_radius=bullseye_radius,
+    )
+
+
+def _score_chunk(layout: Layout, aim_x, aim_y, offsets_x, offsets_y, rotations):
+    """Điểm trung bình của từng điểm ngắm, chạy được trong worker process"""
+    calculator = _calculator_for(layout)
+
+    # Mọi điểm ngắm dùng chung một bộ mẫu để bản đồ mượt hơn
+    scores, _ = calculator.calculate_scores(
+        aim_x[:, None] + offsets_x[None, :],
+        aim_y[:, None] + offsets_y[None, :],
+        rotations[None, :],
+        calculator.STANDARD_RADIUS,
+    )
+    return scores.mean(axis=1)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        # spawn thay vì fork: process chính có Qt và các thread của TCPClient
+        _pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    return _pool
+
+
+def shutdown():
+    """Dừng các worker process nếu đã khởi động"""
+    global _pool
+
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+def clear_cache():
+    _cache.clear()
+
+
+def compute_aim_map(
+    calculator: DartScoring,
+    sigma: float,
+    rotation: float | Sequence[float] = 0.0,
+    resolution: int = 41,
+    samples: int = 2000,
+    seed: int = 0,
+) -> AimMap:
+    """
+    Ước lượng điểm kỳ vọng trên lưới điểm ngắm bằng Monte Carlo. Cú ném lệch
+    khỏi điểm ngắm theo phân phối chuẩn, độc lập theo x và y.
+
+    Kết quả được cache theo layout, sigma, rotation, resolution, samples và
+    seed. Cần numpy.
+
+    Raises:
+        ImportError: Nếu chưa cài numpy
+
+    Args:
+        calculator: Calculator có layout cần tính
+        sigma: Độ lệch chuẩn của cú ném, theo đơn vị dartboard chuẩn
+        rotation: Góc xoay của dartboard (degrees), hoặc danh sách các góc
+                  có khả năng như nhau khi dartboard đang quay
+        resolution: Số điểm ngắm trên mỗi cạnh của lưới
+        samples: Số cú ném mô phỏng cho mỗi điểm ngắm
+        seed: Seed của bộ sinh số ngẫu nhiên
+
+    Returns:
+        AimMap với mảng chỉ đọc
+    """
+    np = _import_numpy()
+
+    layout = layout_of(calculator)
+    if isinstance(rotation, (int, float)):
+        rotations_key = (float(rotation) % 360,)
+    else:
+        rotations_key = tuple(float(angle) % 360 for angle in rotation)
+
+    key = (layout, float(sigma), rotations_key, resolution, samples, seed)
+    cached = _cache.get(key)
+    if cached is not None:
+        _cache.move_to_end(key)
+        return cached
+
+    rng = np.random.default_rng(seed)
+    offsets_x = rng.normal(0.0, sigma, samples)
+    offsets_y = rng.normal(0.0, sigma, samples)
+    rotations = rng.choice(np.array(rotations_key), samples)
+
+    radius = calculator.STANDARD_RADIUS
+    xs = np.linspace(-radius, radius, resolution)
+    ys = np.linspace(-radius, radius, resolution)
+    aim_x, aim_y = (grid.ravel() for grid in np.meshgrid(xs, ys))
+
+    chunks = [
+        (
+            layout,
+            aim_x[start : start + CHUNK_POINTS],
+            aim_y[start : start + CHUNK_POINTS],
+            offsets_x,
+            offsets_y,
+            rotations,
+        )
+        for start in range(0, aim_x.size, CHUNK_POINTS)
+    ]
+
+    if aim_x.size * samples >= PARALLEL_THRESHOLD and (os.cpu_count() or 1) > 1:
+        results = list(_get_pool().map(_score_chunk, *zip(*chunks)))
+    else:
+        results = [_score_chunk(*chunk) for chunk in chunks]
+
+    expected = np.concatenate(results).reshape(resolution, resolution)
+    for array in (xs, ys, expected):
+        array.setflags(write=False)
+
+    aim_map = AimMap(xs, ys, expected)
+    _cache[key] = aim_map
+    while len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+    return aim_map
@@ -0,0 +1,41 @@
+from threading import Lock
+from typing import Callable
+from uuid import UUID, uuid4
+
+type Callback = Callable[[dict], None]
+
+
+class CallbackRegistry:
+    """
+    Registry callback theo id, copy-on-write.
+
+    Mỗi lần thêm/xoá callback sẽ dựng lại tuple `snapshot` bất biến, nên luồng
+    đọc (bridge thread) chỉ cần đọc một attribute, không lock và không copy.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._callbacks: dict[UUID, Callback] = {}
+
+        self.snapshot: tuple[Callback, ...] = ()
+
+    def add(self, callback: Callback, id: UUID | None = None) -> UUID:
+        if id is None:
+            id = uuid4()
+
+        with self._lock:
+            self._callbacks[id] = callback
+            self.snapshot = tuple(self._callbacks.values())
+
+        return id
+
+    def remove(self, id: UUID):
+        with self._lock:
+            # Callback có thể đã tự gỡ trên bridge thread
+            if self._callbacks.pop(id, None) is None:
+                return
+
+            self.snapshot = tuple(self._callbacks.values())
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
@@ -1,4 +1,5 @@
-from typing import Callable
+import asyncio
+from typing import Any, Callable
 from uuid import UUID
 
 from .message_filter import (
@@ -9,6 +10,7 @@ from .message_filter import (
     is_other_threw_event,
     is_player_forfeited_event,
     is_player_go_offline_event,
+    is_presence_delta_event,
     is_start_game_event,
 )
 
@@ -22,6 +24,106 @@ from .tcp_client import TCPClient
 
 type EventCallback = Callable[[dict], None]
 
+_STREAM_CLOSED = object()
+
+
+def _to_camel_case(name: str) -> str:
+    head, *tail = name.split("_")
+    return head + "".join(part.capitalize() for part in tail)
+
+
+class EventStream:
+    """
+    Async iterator trả về body của một loại event từ server.
+
+    Message được lọc ngay trên bridge thread, chỉ event thoả các điều kiện
+    mới được chuyển sang loop. Body được giữ trong một queue có giới hạn trên
+    loop đã mở stream; khi người đọc không theo kịp, body cũ nhất bị bỏ.
+    Sau `close()`, vòng lặp kết thúc ngay khi đọc hết những gì còn trong queue.
+    """
+
+    def __init__(
+        self,
+        client: TCPClient,
+        event: str,
+        filters: dict[str, Any],
+        maxsize: int,
+    ) -> None:
+        self._client = client
+        self._event = event
+        self._filters = filters
+
+        self._loop = asyncio.get_running_loop()
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize)
+
+        self.dropped = 0
+        self._closed = False
+        self._callback_id = client.add_callback(self._on_message)
+
+    def _matches(self, message: dict) -> bool:
+        if message.get("event") != self._event:
+            return False
+
+        if not self._filters:
+            return True
+
+        body = message.get("body")
+        if not isinstance(body, dict):
+            return False
+
+        return all(body.get(key) == value for key, value in self._filters.items())
+
+    def _on_message(self, message: dict):
+        if not self._matches(message):
+            return
+
+        try:
+            self._loop.call_soon_threadsafe(self._deliver, message["body"])
+        except RuntimeError:
+            # Loop đã đóng, không còn ai đọc stream này nữa
+            self._closed = True
+            self._client.remove_callback(self._callback_id)
+
+    def _deliver(self, body):
+        # Message đã được xếp lịch trước khi close, không đưa vào sau sentinel
+        if not self._closed:
+            self._put(body)
+
+    def _put(self, item):
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+
+        self._queue.put_nowait(item)
+
+    def close(self):
+        if self._closed:
+            return
+
+        self._closed = True
+        self._client.remove_callback(self._callback_id)
+        self._put(_STREAM_CLOSED)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        # Stream đã đóng và sentinel đã được đọc: kết thúc ngay, không chờ
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+
+        item = await self._queue.get()
+        if item is _STREAM_CLOSED:
+            raise StopAsyncIteration
+
+        return item
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
 
 class ClientEventHelper:
     def __init__(self, client: TCPClient) -> None:
@@ -30,6 +132,25 @@ class ClientEventHelper:
     def remove_event(self, id: UUID):
         self._client.remove_callback(id)
 
+    def stream(self, event: str, *, maxsize: int = 64, **filters) -> EventStream:
+        """
+        Mở stream cho một loại event, dùng với `async for`.
+
+        Args:
+            event: Tên event (vd: "otherThrew")
+            maxsize: Số body tối đa được giữ trong buffer
+            **filters: Điều kiện trên body, tên snake_case được so với
+                key camelCase (vd: match_id=1 -> body["matchId"] == 1)
+
+        Phải được gọi trong event loop sẽ đọc stream. Ví dụ:
+
+            async with events.stream("otherThrew", match_id=match_id) as throws:
+                async for body in throws:
+                    ...
+        """
+        filters = {_to_camel_case(key): value for key, value in filters.items()}
+        return EventStream(self._client, event, filters, maxsize)
+
     def on_new_player_online(self, callback: EventCallback):
         def client_callback(message: dict):
             if not is_new_player_online_event(message):
@@ -50,6 +171,16 @@ class ClientEventHelper:
 
         return self._client.add_callback(client_callback)
 
+    def on_presence_delta(self, callback: EventCallback):
+        def client_callback(message: dict):
+            if not is_presence_delta_event(message):
+                return
+
+            body = message["body"]
+            callback(body)
+
+        return self._client.add_callback(client_callback)
+
     def on_received_challenge(self, callback: EventCallback):
         def client_callback(message: dict):
             if not is_new_challenger_event(message):
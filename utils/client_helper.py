@@ -1,7 +1,12 @@
+import asyncio
+import json
 from typing import Literal
 
 from .tcp_client import TCPClient
 
+# Giữ reference tới các task tải lại chạy nền để không bị GC giữa chừng
+_background_refreshes: set[asyncio.Task] = set()
+
 
 def _raise_if_not_ok(response: dict):
     is_ok = response.get("ok", False)
@@ -15,10 +20,150 @@ def _raise_if_not_ok(response: dict):
     raise ValueError(message)
 
 
+class RowStream:
+    """
+    Nhận một danh sách lớn theo từng dòng và trả về theo từng lô.
+
+    Dùng `async for batch in stream`; sau khi duyệt xong, `body` chứa phần
+    còn lại của response kết thúc (vd: version của snapshot). Nếu server không
+    hỗ trợ stream và trả về cả danh sách trong một response, danh sách đó
+    (hoặc trường `list_key` của body) được chia lô như bình thường.
+
+    Nếu có `first_reply_timeout`, stream raise TimeoutError khi server không
+    gửi message nào trong khoảng thời gian đó (vd: server bỏ qua command lạ).
+    Sau message đầu tiên thì không giới hạn thời gian, snapshot lớn có thể
+    tải lâu.
+    """
+
+    def __init__(
+        self,
+        client: TCPClient,
+        request: dict,
+        batch_size: int,
+        list_key: str = "players",
+        first_reply_timeout: float | None = None,
+    ) -> None:
+        self._client = client
+        self._request = request
+        self._batch_size = batch_size
+        self._list_key = list_key
+        self._first_reply_timeout = first_reply_timeout
+
+        self.body: dict = {}
+        self.rows = 0
+
+    async def _messages(self):
+        messages = self._client.send_stream(self._request)
+        try:
+            first = await asyncio.wait_for(
+                anext(messages, None), self._first_reply_timeout
+            )
+            if first is None:
+                return
+
+            yield first
+            async for message in messages:
+                yield message
+        finally:
+            await messages.aclose()
+
+    async def __aiter__(self):
+        batch = []
+
+        async for message in self._messages():
+            if "row" in message:
+                batch.append(message["row"])
+                self.rows += 1
+
+                if len(batch) >= self._batch_size:
+                    yield batch
+                    batch = []
+                continue
+
+            _raise_if_not_ok(message)
+
+            body = message.get("body")
+            if isinstance(body, list):
+                rows, body = body, {}
+            elif isinstance(body, dict):
+                body = dict(body)
+                rows = body.pop(self._list_key, [])
+            else:
+                rows, body = [], {}
+
+            self.body = body
+            batch.extend(rows)
+            self.rows += len(rows)
+
+        # Phần còn lại, hoặc cả danh sách nếu server không hỗ trợ stream
+        for start in range(0, len(batch), self._batch_size):
+            yield batch[start : start + self._batch_size]
+
+
 class ClientHelper:
     def __init__(self, client: TCPClient) -> None:
         self._client = client
 
+    @property
+    def deduplicated_requests(self) -> int:
+        """Số request chỉ đọc đã được gộp vào một request giống hệt đang chạy"""
+        return self._client.single_flight.deduplicated
+
+    async def _send_idempotent(self, request: dict) -> dict:
+        """
+        Gửi request chỉ đọc; các lời gọi giống hệt đang chạy dùng chung một response.
+        Response được chia sẻ giữa các người gọi nên không được sửa trực tiếp.
+        """
+        key = json.dumps(request, sort_keys=True)
+        return await self._client.single_flight.do(
+            key, lambda: self._client.send_object(request)
+        )
+
+    async def _send_cached(
+        self, request: dict, stale_while_revalidate: bool = False
+    ) -> dict:
+        """
+        Gửi request chỉ đọc qua cache của phiên kết nối.
+
+        Args:
+            request: Request cần gửi
+            stale_while_revalidate: Nếu entry đã cũ, trả ngay response cũ và
+                tải lại ở nền thay vì chờ server. Chỉ dùng trong event loop
+                chạy lâu dài (GUI loop), không dùng trong `sync_await`.
+        """
+        cache = self._client.response_cache
+        key = json.dumps(request, sort_keys=True)
+
+        cached = cache.lookup(key)
+        if cached is not None:
+            response, is_fresh = cached
+            if is_fresh:
+                return response
+
+            if stale_while_revalidate:
+                task = asyncio.ensure_future(self._refresh_cached(request, key))
+                _background_refreshes.add(task)
+                task.add_done_callback(_background_refreshes.discard)
+                return response
+
+        return await self._refresh_cached(request, key)
+
+    async def _refresh_cached(self, request: dict, key: str) -> dict:
+        cache = self._client.response_cache
+        command = request["command"]
+
+        generation = cache.generation(command)
+        response = await self._send_idempotent(dict(request))
+
+        if response.get("ok", False):
+            cache.store(key, command, response, generation)
+
+        return response
+
+    def invalidate_online_players(self):
+        """Đánh dấu danh sách online đã cũ (vd: sau khi kết thúc trận)"""
+        self._client.response_cache.invalidate("listOnline")
+
     async def login(self, username: str, password: str):
         request = {
             "command": "login",
@@ -43,14 +188,113 @@ class ClientHelper:
         response = await self._client.send_object(request)
         _raise_if_not_ok(response)
 
-    async def get_online_players(self) -> list[dict]:
-        request = {"command": "listOnline"}
+    async def check_username(self, username: str) -> bool:
+        """
+        Hỏi server username còn trống hay không.
+
+        Raises:
+            ValueError: Nếu server từ chối hoặc không hỗ trợ command này
+        """
+        request = {
+            "command": "checkUsername",
+            "body": {"username": username},
+        }
 
         response = await self._client.send_object(request)
         _raise_if_not_ok(response)
 
+        return response["body"]["available"]
+
+    async def get_online_players(
+        self, stale_while_revalidate: bool = False
+    ) -> list[dict]:
+        request = {"command": "listOnline"}
+
+        response = await self._send_cached(request, stale_while_revalidate)
+        _raise_if_not_ok(response)
+
         return response["body"]
 
+    async def get_online_players_page(
+        self,
+        offset: int,
+        limit: int,
+        sort_by: str = "rank",
+        descending: bool = True,
+        username: str | None = None,
+    ) -> tuple[list[dict], int]:
+        """
+        Lấy một trang của danh sách người chơi online.
+
+        Args:
+            offset: Vị trí bắt đầu trong danh sách đã sắp xếp
+            limit: Số người chơi tối đa của trang
+            sort_by: "rank" (winRate rồi totalScore) hoặc tên một trường stats
+            descending: Sắp xếp giảm dần
+            username: Chỉ lấy đúng người chơi này
+
+        Returns:
+            Tuple (players, total) với total là tổng số người chơi phù hợp
+        """
+        body = {
+            "offset": offset,
+            "limit": limit,
+            "sortBy": sort_by,
+            "descending": descending,
+        }
+        if username is not None:
+            body["username"] = username
+
+        request = {"command": "listOnline", "body": body}
+
+        response = await self._send_cached(request)
+        _raise_if_not_ok(response)
+
+        page = response["body"]
+        if isinstance(page, dict):
+            return page["players"], page["total"]
+
+        # Server không hỗ trợ phân trang, trả về cả danh sách: tự cắt trang
+        players = page
+        if username is not None:
+            players = [p for p in players if p["username"] == username]
+
+        if sort_by == "rank":
+            key = lambda p: (p.get("winRate", 0), p.get("totalScore", 0))
+        else:
+            key = lambda p: p.get(sort_by, 0)
+
+        players = sorted(players, key=lambda p: p["username"])
+        players.sort(key=key, reverse=descending)
+
+        return players[offset : offset + limit], len(players)
+
+    def stream_online_players(self, batch_size: int = 500) -> RowStream:
+        """
+        Lấy danh sách người chơi online theo từng lô, mỗi người chơi được
+        decode ngay khi tới thay vì chờ cả danh sách.
+        """
+        request = {"command": "listOnline", "body": {"stream": True}}
+        return RowStream(self._client, request, batch_size)
+
+    def stream_presence_snapshot(
+        self, batch_size: int = 500, first_reply_timeout: float | None = None
+    ) -> RowStream:
+        """
+        Đăng ký nhận presence theo phiên bản (event `presenceDelta`). Snapshot
+        danh sách online được nhận theo từng lô; sau khi duyệt xong,
+        `body["version"]` là version của snapshot, các delta sau đó có seq bắt
+        đầu từ version + 1.
+
+        Khi duyệt, stream raise ValueError nếu server từ chối hoặc không hỗ trợ
+        command này, TimeoutError nếu server không trả lời gì trong
+        `first_reply_timeout` giây.
+        """
+        request = {"command": "subscribePresence", "body": {"stream": True}}
+        return RowStream(
+            self._client, request, batch_size, first_reply_timeout=first_reply_timeout
+        )
+
     async def send_challenge(self, to: str):
         request = {
             "command": "challengePlayer",
@@ -62,6 +306,16 @@ class ClientHelper:
 
         return response["body"]
 
+    async def cancel_challenge(self, challenge_id: int):
+        """Rút lại một lời thách đấu chưa được trả lời"""
+        request = {
+            "command": "cancelChallenge",
+            "body": {"challengeId": challenge_id},
+        }
+
+        response = await self._client.send_object(request)
+        _raise_if_not_ok(response)
+
     async def answer_challenge(
         self,
         challenge_id: int,
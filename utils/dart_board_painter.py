@@ -6,7 +6,7 @@ Tách biệt logic rendering khỏi widget để dễ test và maintain.
 import math
 
 from PyQt5.QtCore import QPointF, QRectF, Qt
-from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPen
+from PyQt5.QtGui import QBrush, QColor, QFont, QPainter, QPainterPath, QPen
 
 
 class DartBoardPainter:
@@ -50,6 +50,9 @@ class DartBoardPainter:
         # Vẽ các segments
         self._draw_segments(painter, radius)
 
+        # Vẽ các vòng nhân điểm
+        self._draw_rings(painter, radius)
+
         # Vẽ bullseye
         self._draw_bullseye(painter, radius)
 
@@ -84,6 +87,26 @@ class DartBoardPainter:
 
             current_angle += angle_width
 
+    def _draw_rings(self, painter: QPainter, radius: float):
+        """
+        Vẽ các vòng nhân điểm (double/triple) đè lên segments.
+
+        Args:
+            painter: QPainter instance
+            radius: Bán kính của dartboard
+        """
+        scale = radius / self.score_calculator.STANDARD_RADIUS
+
+        painter.setPen(QPen(Qt.black, 1))
+        painter.setBrush(QBrush(QColor(255, 255, 255, 90)))
+
+        for inner, outer, _ in self.score_calculator.rings:
+            # Hình vành khăn: hình tròn ngoài trừ hình tròn trong
+            path = QPainterPath()
+            path.addEllipse(QPointF(0, 0), outer * scale, outer * scale)
+            path.addEllipse(QPointF(0, 0), inner * scale, inner * scale)
+            painter.drawPath(path)
+
     def _draw_bullseye(self, painter: QPainter, radius: float):
         """
         Vẽ bullseye (tâm) của dartboard.
@@ -97,7 +120,7 @@ class DartBoardPainter:
 
         # Scale bullseye radius theo tỷ lệ dartboard hiện tại
         bullseye_radius = radius * (
-            self.score_calculator.BULLSEYE_RADIUS
+            self.score_calculator.bullseye_radius
             / self.score_calculator.STANDARD_RADIUS
         )
 
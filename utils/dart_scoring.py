@@ -0,0 +1,365 @@
+import math
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class DartScoring:
+    """
+    Hình học và logic tính điểm của dartboard, không phụ thuộc Qt.
+
+    Dữ liệu chỉ gồm tuple và số nên import nhanh, dùng được trong worker
+    process, benchmark hay server giả lập. UI dùng DartScoreCalculator, một
+    lớp mỏng phía trên đổi màu sang QColor và toạ độ sang QPointF.
+    """
+
+    # Định nghĩa segments
+    # Format: (điểm_số, góc_độ, màu_sắc), màu là mã hex
+    DEFAULT_SEGMENTS = (
+        (1, 36, "#85C1E9"),
+        (5, 36, "#FFEAA7"),
+        (1, 36, "#96CEB4"),
+        (10, 36, "#F7DC6F"),
+        (1, 36, "#98D8C8"),
+        (25, 36, "#DDA0DD"),
+        (1, 36, "#4ECDC4"),
+        (10, 36, "#BB8FCE"),
+        (1, 36, "#45B7D1"),
+        (50, 36, "#FF6B6B"),
+    )
+
+    # Điểm số cho bullseye (tâm)
+    BULLSEYE_SCORE = 100
+
+    # Kích thước dartboard chuẩn để tính điểm (logic size)
+    STANDARD_RADIUS = 200.0
+
+    # Bán kính bullseye trên dartboard chuẩn (8% của STANDARD_RADIUS)
+    BULLSEYE_RADIUS = STANDARD_RADIUS * 0  # 16 pixels
+
+    # Các vòng nhân điểm (double/triple...)
+    # Format: (bán_kính_trong, bán_kính_ngoài, hệ_số) trên dartboard chuẩn
+    DEFAULT_RINGS = ()
+
+    # Lý do trả về khi trúng vòng có hệ số tương ứng
+    RING_REASONS = {2: "double", 3: "triple"}
+
+    # Mã lý do của calculate_scores, REASON_CODES[code] là lý do tương ứng
+    REASON_CODES = ("miss", "bullseye", "segment", "double", "triple", "ring")
+
+    def __init__(
+        self,
+        segments: list[list] | tuple[tuple, ...] | None = None,
+        rings: list[list] | tuple[tuple, ...] | None = None,
+        bullseye_radius: float | None = None,
+    ):
+        """
+        Khởi tạo calculator với segments tùy chỉnh hoặc mặc định.
+
+        Args:
+            segments: Các segment theo format (score, angle_width, color)
+                     Nếu None, sử dụng DEFAULT_SEGMENTS
+            rings: Các vòng theo format (inner_radius, outer_radius, multiplier)
+                  Nếu None, sử dụng DEFAULT_RINGS
+            bullseye_radius: Bán kính bullseye trên dartboard chuẩn
+                            Nếu None, sử dụng BULLSEYE_RADIUS
+        """
+        self.segments = tuple(
+            map(tuple, segments if segments is not None else self.DEFAULT_SEGMENTS)
+        )
+        self.rings = tuple(
+            map(tuple, rings if rings is not None else self.DEFAULT_RINGS)
+        )
+        self.bullseye_radius = (
+            bullseye_radius if bullseye_radius is not None else self.BULLSEYE_RADIUS
+        )
+        self._validate_segments()
+        self._validate_rings()
+        self._compile()
+
+    def _validate_rings(self):
+        """Kiểm tra các vòng nằm trong bảng và không chồng lên nhau"""
+        previous_outer = self.bullseye_radius
+        for inner, outer, multiplier in sorted(self.rings):
+            if not previous_outer <= inner < outer <= self.STANDARD_RADIUS:
+                raise ValueError(f"Vòng [{inner}, {outer}] không hợp lệ")
+            previous_outer = outer
+
+    def _compile(self):
+        """
+        Dựng sẵn bảng tra cứu từ segments và rings để mỗi lần tính điểm chỉ
+        cần hai lần bisect: một theo bán kính (bình phương), một theo góc.
+        """
+        # Góc kết thúc của từng segment, cộng dồn đúng thứ tự như khi duyệt
+        self._angle_bounds = list(accumulate(seg[1] for seg in self.segments))
+        scores = [seg[0] for seg in self.segments]
+
+        # Các dải bán kính: dải i nằm giữa _radius_bounds[i - 1] và _radius_bounds[i]
+        radius_bounds = []
+        multipliers = [1]
+        for inner, outer, multiplier in sorted(self.rings):
+            if radius_bounds and radius_bounds[-1] == inner:
+                multipliers[-1:] = [multiplier]
+            else:
+                radius_bounds.append(inner)
+                multipliers.append(multiplier)
+
+            radius_bounds.append(outer)
+            multipliers.append(1)
+
+        self._radius_bounds_sq = [radius**2 for radius in radius_bounds]
+        self._bullseye_radius_sq = self.bullseye_radius**2
+        self._standard_radius_sq = self.STANDARD_RADIUS**2
+
+        # Bảng bán kính x góc: điểm và lý do của từng ô
+        self._score_table = [
+            [score * multiplier for score in scores] for multiplier in multipliers
+        ]
+        self._band_reasons = [
+            "segment" if multiplier == 1 else self.RING_REASONS.get(multiplier, "ring")
+            for multiplier in multipliers
+        ]
+        self._band_reason_codes = [
+            self.REASON_CODES.index(reason) for reason in self._band_reasons
+        ]
+
+        # Bản numpy của bảng tra cứu, chỉ dựng khi calculate_scores được gọi
+        self._arrays = None
+
+    def _segment_index(self, angle: float) -> int:
+        index = bisect_right(self._angle_bounds, angle)
+
+        # Fallback - trường hợp góc 360 (do floating point)
+        return index if index < len(self._angle_bounds) else 0
+
+    def _validate_segments(self):
+        """Kiểm tra tính hợp lệ của segments"""
+        if not self.segments:
+            raise ValueError("Segments không được rỗng")
+
+        total_angle = sum(seg[1] for seg in self.segments)
+        if not math.isclose(total_angle, 360.0, rel_tol=1e-5):
+            raise ValueError(
+                f"Tổng góc của segments phải bằng 360°, nhưng là {total_angle}°"
+            )
+
+    def calculate_score(
+        self, dx: float, dy: float, rotation_angle: float, max_radius: float
+    ) -> tuple[int, str]:
+        """
+        Tính điểm dựa trên vị trí click (dx, dy) từ tâm.
+
+        Args:
+            dx: Khoảng cách x từ tâm (pixel)
+            dy: Khoảng cách y từ tâm (pixel)
+            rotation_angle: Góc xoay hiện tại của dartboard (degrees)
+            max_radius: Bán kính tối đa của dartboard (pixel)
+
+        Returns:
+            Tuple (score, reason):
+                - score: Điểm số (int)
+                - reason: Lý do ("bullseye", "segment", "miss")
+        """
+        # Normalize tọa độ về dartboard chuẩn để tính điểm nhất quán
+        # Scale factor: chuyển từ kích thước hiện tại về kích thước chuẩn
+        scale_factor = self.STANDARD_RADIUS / max_radius
+        dx_normalized = dx * scale_factor
+        dy_normalized = dy * scale_factor
+
+        # So sánh bình phương khoảng cách, không cần sqrt
+        distance_sq = dx_normalized**2 + dy_normalized**2
+
+        # 1. Kiểm tra Bullseye (tâm)
+        if distance_sq < self._bullseye_radius_sq:
+            return self.BULLSEYE_SCORE, "bullseye"
+
+        # 2. Kiểm tra xem có trượt không (ngoài bảng)
+        if distance_sq > self._standard_radius_sq:
+            return 0, "miss"
+
+        # 3. Xác định segment dựa trên góc
+        angle_rad = math.atan2(dy_normalized, dx_normalized)
+        angle_deg = math.degrees(angle_rad)
+
+        # Chuyển từ [-180, 180] sang [0, 360]
+        if angle_deg < 0:
+            angle_deg += 360
+
+        # Điều chỉnh góc theo rotation hiện tại của dartboard
+        adjusted_angle = (angle_deg - (rotation_angle % 360)) % 360
+
+        # Tra bảng theo dải bán kính và segment
+        band = bisect_right(self._radius_bounds_sq, distance_sq)
+        segment = self._segment_index(adjusted_angle)
+
+        return self._score_table[band][segment], self._band_reasons[band]
+
+    def _compile_arrays(self, np):
+        if self._arrays is None:
+            self._arrays = (
+                np.asarray(self._angle_bounds, dtype=np.float64),
+                np.asarray(self._radius_bounds_sq, dtype=np.float64),
+                np.asarray(self._score_table, dtype=np.int64),
+                np.asarray(self._band_reason_codes, dtype=np.int8),
+            )
+
+        return self._arrays
+
+    def calculate_scores(self, dx, dy, rotation_angle, max_radius: float):
+        """
+        Tính điểm cho nhiều cú ném cùng lúc, kết quả giống calculate_score cho
+        từng phần tử. Riêng điểm nằm đúng trên biên segment có thể rơi sang
+        segment bên cạnh do arctan2 của numpy làm tròn khác math.atan2.
+        Cần numpy (có trong requirement.txt, được import khi gọi lần đầu).
+
+        Args:
+            dx: Mảng khoảng cách x từ tâm (pixel)
+            dy: Mảng khoảng cách y từ tâm (pixel), cùng shape với dx
+            rotation_angle: Góc xoay (degrees), một số hoặc mảng cùng shape
+            max_radius: Bán kính tối đa của dartboard (pixel)
+
+        Returns:
+            Tuple (scores, reasons):
+                - scores: Mảng điểm số (int64)
+                - reasons: Mảng mã lý do (int8), xem REASON_CODES
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("calculate_scores cần cài đặt numpy") from e
+
+        angle_bounds, radius_bounds_sq, score_table, band_reason_codes = (
+            self._compile_arrays(np)
+        )
+
+        scale_factor = self.STANDARD_RADIUS / max_radius
+        dx_normalized = np.asarray(dx, dtype=np.float64) * scale_factor
+        dy_normalized = np.asarray(dy, dtype=np.float64) * scale_factor
+
+        distance_sq = dx_normalized**2 + dy_normalized**2
+
+        angle_deg = np.degrees(np.arctan2(dy_normalized, dx_normalized))
+        angle_deg = np.where(angle_deg < 0, angle_deg + 360, angle_deg)
+        adjusted_angle = np.mod(angle_deg - np.mod(rotation_angle, 360), 360)
+
+        band = np.searchsorted(radius_bounds_sq, distance_sq, side="right")
+        segment = np.searchsorted(angle_bounds, adjusted_angle, side="right")
+        segment = np.where(segment < len(angle_bounds), segment, 0)
+
+        bullseye = distance_sq < self._bullseye_radius_sq
+        miss = distance_sq > self._standard_radius_sq
+
+        scores = np.where(
+            bullseye,
+            self.BULLSEYE_SCORE,
+            np.where(miss, 0, score_table[band, segment]),
+        )
+        reasons = np.where(
+            bullseye,
+            self.REASON_CODES.index("bullseye"),
+            np.where(miss, self.REASON_CODES.index("miss"), band_reason_codes[band]),
+        ).astype(np.int8)
+
+        return scores, reasons
+
+    def _get_segment_score(self, angle: float) -> int:
+        """
+        Lấy điểm của segment dựa trên góc.
+
+        Args:
+            angle: Góc đã được normalize [0, 360)
+
+        Returns:
+            Điểm số của segment
+        """
+        return self.segments[self._segment_index(angle)][0]
+
+    def get_segment_at_angle(self, angle: float) -> tuple[int, int, object]:
+        """
+        Lấy thông tin segment tại góc cho trước.
+
+        Args:
+            angle: Góc [0, 360)
+
+        Returns:
+            Tuple (score, angle_width, color) của segment
+        """
+        score, angle_width, color = self.segments[self._segment_index(angle)]
+        return score, angle_width, color
+
+    def transform_hit_point(
+        self, dx: float, dy: float, rotation_angle: float
+    ) -> tuple[float, float]:
+        """
+        Biến đổi tọa độ hit point để hiển thị đúng trên dartboard đã xoay.
+        Xoay ngược lại -rotation_angle để tọa độ local đúng với hệ tọa độ vẽ.
+
+        Args:
+            dx: Khoảng cách x từ tâm (pixel)
+            dy: Khoảng cách y từ tâm (pixel)
+            rotation_angle: Góc xoay hiện tại của dartboard (degrees)
+
+        Returns:
+            Tuple (x, y) với tọa độ đã được biến đổi
+        """
+        theta = math.radians(-rotation_angle)
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+
+        x_local = dx * cos_t - dy * sin_t
+        y_local = dx * sin_t + dy * cos_t
+
+        return x_local, y_local
+
+    def is_in_bullseye(self, dx: float, dy: float, max_radius: float) -> bool:
+        """
+        Kiểm tra xem điểm có nằm trong vùng bullseye không.
+
+        Args:
+            dx: Khoảng cách x từ tâm
+            dy: Khoảng cách y từ tâm
+            max_radius: Bán kính tối đa của dartboard
+
+        Returns:
+            True nếu trong bullseye, False nếu không
+        """
+        # Normalize về dartboard chuẩn
+        scale_factor = self.STANDARD_RADIUS / max_radius
+        dx_normalized = dx * scale_factor
+        dy_normalized = dy * scale_factor
+        return dx_normalized**2 + dy_normalized**2 < self._bullseye_radius_sq
+
+    def is_out_of_bounds(self, dx: float, dy: float, max_radius: float) -> bool:
+        """
+        Kiểm tra xem điểm có nằm ngoài dartboard không.
+
+        Args:
+            dx: Khoảng cách x từ tâm
+            dy: Khoảng cách y từ tâm
+            max_radius: Bán kính tối đa của dartboard
+
+        Returns:
+            True nếu ngoài dartboard, False nếu không
+        """
+        # Normalize về dartboard chuẩn
+        scale_factor = self.STANDARD_RADIUS / max_radius
+        dx_normalized = dx * scale_factor
+        dy_normalized = dy * scale_factor
+        return dx_normalized**2 + dy_normalized**2 > self._standard_radius_sq
+
+    def get_segments(self) -> list[list]:
+        """Trả về danh sách segments hiện tại (bản copy dạng list)"""
+        return [list(segment) for segment in self.segments]
+
+    def set_segments(self, segments: list[list] | tuple[tuple, ...]):
+        """
+        Cập nhật segments mới.
+
+        Args:
+            segments: Các segment mới
+
+        Raises:
+            ValueError: Nếu segments không hợp lệ
+        """
+        self.segments = tuple(map(tuple, segments))
+        self._validate_segments()
+        self._compile()
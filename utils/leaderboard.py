@@ -0,0 +1,104 @@
+import heapq
+from bisect import bisect_left, insort
+from typing import Callable
+
+
+class TopKLeaderboard:
+    """
+    Giữ k người chơi đứng đầu theo `key` (key nhỏ hơn xếp trên), cập nhật
+    từng người chơi mà không sắp xếp lại cả roster.
+
+    Top k nằm trong một mảng đã sắp xếp (k nhỏ), phần còn lại nằm trong một
+    heap với xoá lười: entry cũ chỉ bị bỏ khi nổi lên đỉnh heap. Mỗi thay đổi
+    tốn O(k + log n).
+    """
+
+    def __init__(self, k: int, key: Callable[[dict], tuple]) -> None:
+        self.k = k
+        self._key = key
+
+        # username -> key hiện tại, cho cả top lẫn phần còn lại
+        self._keys: dict[str, tuple] = {}
+        self._top: list[tuple[tuple, str]] = []
+        self._top_usernames: set[str] = set()
+        self._rest: list[tuple[tuple, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def top(self) -> list[str]:
+        return [username for _, username in self._top]
+
+    def reset(self, players: list[dict]):
+        self._keys = {player["username"]: self._key(player) for player in players}
+
+        entries = sorted((key, username) for username, key in self._keys.items())
+        self._top = entries[: self.k]
+        self._top_usernames = {username for _, username in self._top}
+        self._rest = entries[self.k :]  # đã sắp xếp nên đã là một heap
+
+    def update(self, player: dict):
+        username = player["username"]
+        key = self._key(player)
+
+        if self._keys.get(username) == key:
+            return
+
+        self.remove(username)
+        self._keys[username] = key
+        entry = (key, username)
+
+        if len(self._top) < self.k:
+            self._add_to_top(entry)
+            return
+
+        if entry < self._top[-1]:
+            self._add_to_top(entry)
+
+            # Người cuối của top bị đẩy xuống phần còn lại
+            demoted = self._top.pop()
+            self._top_usernames.discard(demoted[1])
+            heapq.heappush(self._rest, demoted)
+            return
+
+        heapq.heappush(self._rest, entry)
+
+    def remove(self, username: str):
+        key = self._keys.pop(username, None)
+        if key is None:
+            return
+
+        if username not in self._top_usernames:
+            # Entry trong heap thành rác, được bỏ khi nổi lên đỉnh
+            self._compact_rest()
+            return
+
+        del self._top[bisect_left(self._top, (key, username))]
+        self._top_usernames.discard(username)
+
+        promoted = self._pop_rest()
+        if promoted is not None:
+            self._add_to_top(promoted)
+
+    def _add_to_top(self, entry: tuple[tuple, str]):
+        insort(self._top, entry)
+        self._top_usernames.add(entry[1])
+
+    def _is_live(self, entry: tuple[tuple, str]) -> bool:
+        key, username = entry
+        return self._keys.get(username) == key and username not in self._top_usernames
+
+    def _pop_rest(self) -> tuple[tuple, str] | None:
+        while self._rest:
+            entry = heapq.heappop(self._rest)
+            if self._is_live(entry):
+                return entry
+
+        return None
+
+    def _compact_rest(self):
+        # Dọn heap khi rác chiếm quá nửa để bộ nhớ không tăng mãi
+        live = len(self._keys) - len(self._top)
+        if len(self._rest) > 2 * live + 64:
+            self._rest = [entry for entry in self._rest if self._is_live(entry)]
+            heapq.heapify(self._rest)
@@ -36,3 +36,7 @@ def is_other_threw_event(response: dict) -> bool:
 
 def is_player_forfeited_event(response: dict) -> bool:
     return response.get("event") == "playerForfeited"
+
+
+def is_presence_delta_event(response: dict) -> bool:
+    return response.get("event") == "presenceDelta"
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Callable
+
+# username -> body của event online, hoặc None nếu offline
+type PendingPresence = dict[str, object | None]
+
+
+class PresenceDebouncer:
+    """
+    Gộp các event presence đến dồn dập thành một lần áp dụng.
+
+    Event đầu tiên của một đợt hẹn giờ flush sau `window` giây; mọi event đến
+    trong khoảng đó chỉ cập nhật trạng thái cuối cùng của username tương ứng.
+    Event của các username trong `urgent_usernames` được flush ngay.
+    Phải được dùng trên event loop truyền vào.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        on_flush: Callable[[PendingPresence], None],
+        window: float = 0.25,
+    ) -> None:
+        self._loop = loop
+        self._on_flush = on_flush
+        self.window = window
+
+        self._pending: PendingPresence = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+        self.urgent_usernames: set[str] = set()
+
+        self.events = 0
+        self.flushes = 0
+
+    @property
+    def saved_refreshes(self) -> int:
+        """Số lần refresh đã tránh được so với việc refresh theo từng event"""
+        return self.events - self.flushes
+
+    def push(self, username: str, body: object | None):
+        self._pending[username] = body
+        self.events += 1
+
+        if username in self.urgent_usernames:
+            self.flush()
+            return
+
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.window, self.flush)
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        self.flushes += 1
+        self._on_flush(pending)
+
+    def cancel(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        self._pending.clear()
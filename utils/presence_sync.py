@@ -0,0 +1,70 @@
+"""
+Đồng bộ presence theo phiên bản: một snapshot có version, sau đó là các delta
+có số thứ tự (seq) tăng dần. Client biết chính xác khi nào bị mất delta và chỉ
+cần tải lại snapshot trong trường hợp đó.
+"""
+
+# Thời gian chờ delta bị thiếu đến muộn trước khi tải lại snapshot (giây)
+GAP_TIMEOUT = 1.0
+
+
+class PresenceSequencer:
+    """
+    Sắp xếp lại các delta presence theo `seq` và phát hiện delta bị mất.
+
+    Trước khi có snapshot (`version` là None), mọi delta được giữ lại; sau
+    `reset(version)` các delta cũ hơn snapshot bị bỏ, các delta còn lại được
+    trả về đúng thứ tự và không bao giờ nhảy cóc.
+    """
+
+    def __init__(self, max_pending: int = 64) -> None:
+        self.max_pending = max_pending
+
+        self.version: int | None = None
+        self._pending: dict[int, dict] = {}
+
+        self.duplicates = 0
+        self.resyncs = 0
+
+    @property
+    def has_gap(self) -> bool:
+        return self.version is not None and bool(self._pending)
+
+    @property
+    def overflowed(self) -> bool:
+        return len(self._pending) > self.max_pending
+
+    def begin_resync(self):
+        """Ngừng áp dụng delta cho tới khi có snapshot mới"""
+        self.version = None
+        self.resyncs += 1
+
+    def reset(self, version: int) -> list[dict]:
+        """Gắn version của snapshot mới, trả về các delta đã giữ có thể áp dụng"""
+        self.version = version
+        self._pending = {
+            seq: delta for seq, delta in self._pending.items() if seq > version
+        }
+
+        return self._drain()
+
+    def push(self, seq: int, delta: dict) -> list[dict]:
+        """Nhận một delta, trả về các delta đã sẵn sàng theo đúng thứ tự"""
+        if self.version is not None and seq <= self.version:
+            self.duplicates += 1
+            return []
+
+        self._pending[seq] = delta
+        if self.version is None:
+            return []
+
+        return self._drain()
+
+    def _drain(self) -> list[dict]:
+        ready = []
+
+        while self.version + 1 in self._pending:
+            self.version += 1
+            ready.append(self._pending.pop(self.version))
+
+        return ready
@@ -0,0 +1,376 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Literal
+
+from .client_event_helper import ClientEventHelper
+from .client_helper import ClientHelper
+
+# Server cũ có thể không bao giờ trả lời cancelChallenge
+CANCEL_TIMEOUT = 5.0
+
+type ChallengeStatus = Literal[
+    "queued",
+    "sending",
+    "pending",
+    "rejected",
+    "failed",
+    "accepted",
+    "canceled",
+    "expired",
+]
+
+
+@dataclass
+class ChallengeState:
+    username: str
+    challenge_id: int | None = None
+    status: ChallengeStatus = "sending"
+
+
+@dataclass
+class ServerSupport:
+    """Những gì server đã cho thấy là hỗ trợ, học dần qua các lần ghép trận"""
+
+    # Response của challengePlayer có challengeId
+    challenge_ids: bool = False
+    # Event startGame cho biết trận đến từ lời thách đấu nào
+    start_game_ids: bool = False
+    # cancelChallenge đã thành công (True) hoặc bị từ chối (False)
+    cancel: bool | None = None
+
+    @property
+    def fan_out(self) -> bool:
+        return self.challenge_ids and self.start_game_ids and self.cancel is True
+
+
+def _challenge_id_of(body) -> int | None:
+    # Body có thể là {"challengeId": ...} hoặc chỉ là id
+    return body.get("challengeId") if isinstance(body, dict) else body
+
+
+class QuickMatch:
+    """
+    Tìm đối thủ trong danh sách ứng viên, trận được bắt đầu đầu tiên thắng.
+
+    Mặc định lời thách đấu được gửi lần lượt: chỉ gửi cho ứng viên kế tiếp khi
+    ứng viên trước đã từ chối, hoặc đã hết `challenge_timeout` và lời thách
+    đấu được huỷ thành công. Khi server đã cho thấy nó hỗ trợ challengeId
+    (trong response và trong startGame) và cancelChallenge, mọi lời thách đấu
+    được gửi cùng lúc và các lời còn lại bị huỷ khi có người nhận.
+
+    Không bao giờ tự bỏ cuộc một trận: lời thách đấu không huỷ được được giữ
+    trong `left_pending` như một lời thách đấu bình thường, tới khi được nhận
+    hoặc hết `pending_expiry` giây.
+
+    Khi startGame không có challengeId, trận chỉ được đoán là của ghép trận
+    nhanh nếu đúng một lời thách đấu của nó đang chờ và không có lời thách đấu
+    hay lời chấp nhận nào khác (báo qua `note_other_challenge`) còn hiệu lực.
+    """
+
+    def __init__(
+        self,
+        client_helper: ClientHelper,
+        client_event_helper: ClientEventHelper,
+        on_changed: Callable[[], None] | None = None,
+        challenge_timeout: float = 10.0,
+        pending_expiry: float = 60.0,
+    ) -> None:
+        self._client_helper = client_helper
+        self._client_event_helper = client_event_helper
+        self._on_changed = on_changed
+        self._challenge_timeout = challenge_timeout
+        self._pending_expiry = pending_expiry
+        self._loop = asyncio.get_running_loop()
+
+        self.support = ServerSupport()
+        self.fan_out = False
+
+        self.states: dict[str, ChallengeState] = {}
+        self.current: str | None = None
+        self.winner: str | None = None
+        # Username của các lời thách đấu không huỷ được, vẫn có thể được nhận
+        self.left_pending: list[str] = []
+        self._expire_handle: asyncio.TimerHandle | None = None
+
+        # Lời thách đấu gửi tay và lời chấp nhận trong inbox còn hiệu lực,
+        # username -> hẹn giờ hết hạn
+        self._others: dict[str, asyncio.TimerHandle] = {}
+
+        self._done: asyncio.Future | None = None
+        self._answered: asyncio.Future | None = None
+
+    def count(self, status: ChallengeStatus) -> int:
+        return sum(state.status == status for state in self.states.values())
+
+    def _changed(self):
+        if self._on_changed is not None:
+            self._on_changed()
+
+    def outstanding(self) -> list[str]:
+        """
+        Username của các lời thách đấu còn hiệu lực ngoài lần ghép trận đang
+        chạy. Ghép trận mới khi còn những lời này thì không phân biệt được
+        trận bắt đầu là của lời nào.
+        """
+        return [*self.left_pending, *self._others]
+
+    def note_other_challenge(self, username: str):
+        """
+        Báo người dùng vừa gửi tay một lời thách đấu hoặc chấp nhận một lời
+        thách đấu trong inbox. Ghép trận nhanh đang chạy bị dừng và không đoán
+        trận cho tới khi lời đó kết thúc (`forget_other_challenge`) hoặc hết hạn.
+        """
+        self.forget_other_challenge(username)
+        self._others[username] = self._loop.call_later(
+            self._pending_expiry, self._others.pop, username, None
+        )
+        self.cancel()
+
+    def forget_other_challenge(self, username: str):
+        handle = self._others.pop(username, None)
+        if handle is not None:
+            handle.cancel()
+
+    def _expire_left_pending(self):
+        self._expire_handle = None
+
+        for username in self.left_pending:
+            state = self.states.get(username)
+            if state is not None and state.status in ("sending", "pending"):
+                state.status = "expired"
+
+        self.left_pending = []
+        self._changed()
+
+    def _finish(self, winner: str | None):
+        if self._done is not None and not self._done.done():
+            self._done.set_result(winner)
+
+    async def run(self, candidates: list[str], timeout: float = 30.0) -> str | None:
+        """
+        Returns:
+            Username của đối thủ đã chấp nhận, None nếu không ai chấp nhận
+            trong `timeout` giây hoặc bị huỷ
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+
+        if self._expire_handle is not None:
+            self._expire_handle.cancel()
+            self._expire_handle = None
+
+        self._done = loop.create_future()
+        self.winner = None
+        self.current = None
+        self.left_pending = []
+        self.fan_out = self.support.fan_out
+        status = "sending" if self.fan_out else "queued"
+        self.states = {
+            username: ChallengeState(username, status=status)
+            for username in candidates
+        }
+
+        rejections = self._client_event_helper.stream("challengeRejected")
+        consumer = asyncio.ensure_future(self._consume_rejections(rejections))
+
+        try:
+            if self.fan_out:
+                await self._run_fan_out(deadline)
+            else:
+                await self._run_sequential(deadline)
+
+        finally:
+            rejections.close()
+            consumer.cancel()
+
+        self._finish(None)
+        await self._cancel_pending()
+
+        if self.left_pending:
+            self._expire_handle = loop.call_later(
+                self._pending_expiry, self._expire_left_pending
+            )
+
+        return self.winner
+
+    def cancel(self):
+        """Dừng ghép trận, các lời thách đấu đang chờ sẽ bị huỷ"""
+        self._finish(None)
+
+    async def _run_fan_out(self, deadline: float):
+        await asyncio.gather(*(self._send(state) for state in self.states.values()))
+        if self.count("pending") == 0:
+            self._finish(None)
+
+        remaining = deadline - asyncio.get_running_loop().time()
+        await asyncio.wait({self._done}, timeout=max(remaining, 0))
+
+    async def _run_sequential(self, deadline: float):
+        loop = asyncio.get_running_loop()
+
+        for state in self.states.values():
+            remaining = deadline - loop.time()
+            if self._done.done() or remaining <= 0:
+                return
+
+            self.current = state.username
+            self._answered = loop.create_future()
+            state.status = "sending"
+            await self._send(state)
+
+            if state.status == "pending":
+                await asyncio.wait(
+                    {self._answered, self._done},
+                    timeout=min(self._challenge_timeout, remaining),
+                )
+
+            if self._done.done():
+                return
+
+            if state.status in ("sending", "pending") and not await self._withdraw(
+                state
+            ):
+                # Lời thách đấu vẫn còn hiệu lực: không gửi thêm để tránh hai trận
+                return
+
+    async def _send(self, state: ChallengeState):
+        try:
+            body = await self._client_helper.send_challenge(state.username)
+        except Exception as e:
+            print(f"[ERROR] Quick match challenge to {state.username} failed: {e}")
+            state.status = "failed"
+        else:
+            state.challenge_id = _challenge_id_of(body)
+            if state.challenge_id is not None:
+                self.support.challenge_ids = True
+
+            # Trận có thể đã bắt đầu trước khi response về tới
+            if state.status == "sending":
+                state.status = "pending"
+
+        self._changed()
+
+    async def _withdraw(self, state: ChallengeState) -> bool:
+        """Huỷ một lời thách đấu, trả về False nếu nó có thể vẫn còn hiệu lực"""
+        if state.challenge_id is None:
+            self.left_pending.append(state.username)
+            return False
+
+        try:
+            await asyncio.wait_for(
+                self._client_helper.cancel_challenge(state.challenge_id),
+                CANCEL_TIMEOUT,
+            )
+        except TimeoutError:
+            print(
+                f"[DEBUG] No reply to cancelChallenge after {CANCEL_TIMEOUT}s, "
+                f"keeping challenge to {state.username}"
+            )
+            if self.support.cancel is None:
+                self.support.cancel = False
+            self.left_pending.append(state.username)
+            return False
+        except ValueError as e:
+            print(f"[DEBUG] Cannot cancel challenge to {state.username}: {e}")
+            self.support.cancel = False
+            self.left_pending.append(state.username)
+            return False
+        except Exception as e:
+            print(f"[ERROR] Cannot cancel challenge to {state.username}: {e}")
+            self.left_pending.append(state.username)
+            return False
+
+        self.support.cancel = True
+
+        # Trận có thể đã bắt đầu trong lúc chờ server huỷ
+        if state.status in ("sending", "pending"):
+            state.status = "canceled"
+            self._changed()
+
+        return True
+
+    async def _cancel_pending(self):
+        pending = [
+            state
+            for state in self.states.values()
+            if state.status in ("sending", "pending")
+            and state.username not in self.left_pending
+        ]
+
+        await asyncio.gather(*(self._withdraw(state) for state in pending))
+
+    async def _consume_rejections(self, rejections):
+        async for body in rejections:
+            state = self._find_waiting(_challenge_id_of(body))
+            if state is None:
+                continue
+
+            state.status = "rejected"
+            self._changed()
+
+            if self._answered is not None and not self._answered.done():
+                self._answered.set_result(None)
+
+            if self.fan_out and self.count("pending") + self.count("sending") == 0:
+                self._finish(None)
+
+    def _find_waiting(self, challenge_id) -> ChallengeState | None:
+        waiting = [
+            state
+            for state in self.states.values()
+            if state.status in ("sending", "pending")
+        ]
+
+        if challenge_id is not None:
+            for state in waiting:
+                if state.challenge_id == challenge_id:
+                    return state
+
+            if self.support.challenge_ids:
+                return None
+
+        # Server không cho biết lời thách đấu nào: chỉ đoán khi có đúng một
+        # và không có lời thách đấu nào khác có thể là nguồn của event
+        if len(waiting) != 1 or self._others:
+            return None
+
+        return waiting[0]
+
+    def on_game_started(self, body) -> tuple[str, bool] | None:
+        """
+        Gọi khi nhận event startGame.
+
+        Returns:
+            None nếu trận không đến từ lời thách đấu của ghép trận nhanh, ngược
+            lại là (username đối thủ, trận có được mở hay không). Trận không
+            được mở khi đã có trận khác từ lần ghép trận này; trận đó không bị
+            bỏ cuộc tự động.
+        """
+        challenge_id = None
+        if isinstance(body, dict):
+            challenge_id = body.get("challengeId")
+            if challenge_id is not None:
+                self.support.start_game_ids = True
+
+        state = self._find_waiting(challenge_id)
+        if state is None and isinstance(body, dict):
+            opponent = self.states.get(body.get("opponent"))
+            if opponent is not None and opponent.status in ("sending", "pending"):
+                state = opponent
+
+        if state is None:
+            return None
+
+        state.status = "accepted"
+        self._changed()
+
+        if state.username in self.left_pending:
+            self.left_pending.remove(state.username)
+
+        if self.winner is None:
+            self.winner = state.username
+            self._finish(state.username)
+            return state.username, True
+
+        print(f"[DEBUG] Second quick match game with {state.username} not opened")
+        return state.username, False
@@ -0,0 +1,90 @@
+import time
+from dataclasses import dataclass
+from threading import Lock
+
+# Event từ server làm response của các command nào bị cũ
+DEFAULT_INVALIDATIONS: dict[str, tuple[str, ...]] = {
+    "newUserOnline": ("listOnline",),
+    "userOffline": ("listOnline",),
+    "playerForfeited": ("listOnline",),
+}
+
+
+@dataclass
+class _Entry:
+    command: str
+    response: dict
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Cache read-through cho response của các command chỉ đọc.
+
+    Một entry hết hạn sau `ttl` giây, hoặc ngay khi server đẩy một event làm
+    dữ liệu của command đó bị cũ. Entry hết hạn vẫn được giữ lại để người gọi
+    có thể dùng tạm (stale-while-revalidate) trong lúc tải lại.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5.0,
+        invalidations: dict[str, tuple[str, ...]] = DEFAULT_INVALIDATIONS,
+    ) -> None:
+        self._ttl = ttl
+        self._invalidations = invalidations
+
+        self._lock = Lock()
+        self._entries: dict[str, _Entry] = {}
+        self._generations: dict[str, int] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: str) -> tuple[dict, bool] | None:
+        """
+        Returns:
+            None nếu chưa có entry, ngược lại (response, is_fresh)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            is_fresh = time.monotonic() < entry.expires_at
+            if is_fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+            return entry.response, is_fresh
+
+    def generation(self, command: str) -> int:
+        """Lấy trước khi gửi request, rồi truyền lại cho `store`"""
+        with self._lock:
+            return self._generations.get(command, 0)
+
+    def store(self, key: str, command: str, response: dict, generation: int):
+        with self._lock:
+            expires_at = time.monotonic() + self._ttl
+
+            # Có event invalidate trong lúc request đang chạy: vẫn lưu để dùng
+            # tạm, nhưng coi như đã cũ
+            if self._generations.get(command, 0) != generation:
+                expires_at = 0.0
+
+            self._entries[key] = _Entry(command, response, expires_at)
+
+    def invalidate(self, command: str):
+        with self._lock:
+            self._generations[command] = self._generations.get(command, 0) + 1
+
+            for entry in self._entries.values():
+                if entry.command == command:
+                    entry.expires_at = 0.0
+
+    def on_message(self, message: dict):
+        """Callback cho TCPClient, chạy trên bridge thread"""
+        for command in self._invalidations.get(message.get("event"), ()):
+            self.invalidate(command)
@@ -0,0 +1,145 @@
+import os
+import queue
+import sqlite3
+import time
+from threading import Thread
+
+# Khoá của object người chơi, theo đúng thứ tự cột trong bảng `players`
+_PLAYER_KEYS = ("username", "totalMatches", "wins", "losses", "totalScore", "winRate")
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS players (
+    username TEXT PRIMARY KEY,
+    total_matches INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    total_score INTEGER NOT NULL,
+    win_rate REAL NOT NULL
+)
+"""
+
+_STOP = object()
+
+
+def _as_row(player: dict) -> tuple:
+    return (player["username"], *(player.get(key, 0) for key in _PLAYER_KEYS[1:]))
+
+
+class RosterCache:
+    """
+    Lưu roster và stats đã biết gần nhất xuống SQLite để lobby có dữ liệu
+    ngay sau khi đăng nhập, trước khi server trả lời.
+
+    Ghi được đưa vào hàng đợi và một thread riêng gộp các lần ghi đến trong
+    `batch_window` giây thành một transaction, GUI thread không bao giờ chạm
+    vào đĩa. `load` là hàm blocking, nên gọi qua `run_in_executor`.
+    """
+
+    def __init__(self, path: str, batch_window: float = 0.5) -> None:
+        self._path = path
+        self._batch_window = batch_window
+
+        self._writes: queue.Queue = queue.Queue()
+        self._writer = Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+        self.batches = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self._path) or ".", exist_ok=True)
+
+        connection = sqlite3.connect(self._path)
+        connection.execute(_CREATE_TABLE)
+
+        return connection
+
+    def load(self) -> list[dict]:
+        """Đọc toàn bộ người chơi đã lưu, trả về danh sách rỗng nếu lỗi"""
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[ERROR] Cannot open roster cache {self._path}: {e}")
+            return []
+
+        try:
+            rows = connection.execute(
+                "SELECT username, total_matches, wins, losses, total_score, win_rate "
+                "FROM players"
+            ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[ERROR] Cannot read roster cache: {e}")
+            return []
+        finally:
+            connection.close()
+
+        return [dict(zip(_PLAYER_KEYS, row)) for row in rows]
+
+    def save_players(self, players: list[dict]):
+        self._writes.put(("save", players))
+
+    def remove_players(self, usernames: list[str]):
+        self._writes.put(("remove", usernames))
+
+    def close(self):
+        """Ghi nốt các thay đổi đang chờ rồi dừng thread ghi"""
+        self._writes.put(_STOP)
+        self._writer.join()
+
+    def _next_batch(self) -> list:
+        batch = [self._writes.get()]
+        deadline = time.monotonic() + self._batch_window
+
+        while batch[-1] is not _STOP:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+
+            try:
+                batch.append(self._writes.get(timeout=timeout))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _write_batch(self, connection: sqlite3.Connection, batch: list):
+        with connection:
+            for write in batch:
+                if write is _STOP:
+                    continue
+
+                kind, items = write
+                if kind == "save":
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO players VALUES (?, ?, ?, ?, ?, ?)",
+                        [_as_row(player) for player in items],
+                    )
+                else:
+                    connection.executemany(
+                        "DELETE FROM players WHERE username = ?",
+                        [(username,) for username in items],
+                    )
+
+        self.batches += 1
+
+    def _write_loop(self):
+        try:
+            connection = self._connect()
+        except (OSError, sqlite3.Error) as e:
+            print(f"[ERROR] Cannot open roster cache {self._path}: {e}")
+            connection = None
+
+        try:
+            while True:
+                batch = self._next_batch()
+
+                if connection is not None:
+                    try:
+                        self._write_batch(connection, batch)
+                    except sqlite3.Error as e:
+                        print(f"[ERROR] Cannot write roster cache: {e}")
+
+                if batch[-1] is _STOP:
+                    return
+        finally:
+            if connection is not None:
+                connection.close()
@@ -0,0 +1,45 @@
+from bisect import bisect_left, insort
+
+
+class PrefixIndex:
+    """
+    Index tìm username theo tiền tố, không phân biệt hoa thường.
+
+    Username được giữ trong một mảng đã sắp xếp; thêm/xoá và tìm kiếm đều dùng
+    bisect, tìm kiếm tốn O(log n + k) với k là số kết quả.
+    """
+
+    def __init__(self, usernames=()) -> None:
+        self._keys: list[tuple[str, str]] = sorted(
+            (username.casefold(), username) for username in usernames
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, username: str):
+        key = (username.casefold(), username)
+
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return
+
+        insort(self._keys, key)
+
+    def remove(self, username: str):
+        key = (username.casefold(), username)
+
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def search(self, prefix: str, limit: int | None = None) -> list[str]:
+        """Các username bắt đầu bằng `prefix`, theo thứ tự chữ cái"""
+        prefix = prefix.casefold()
+
+        start = bisect_left(self._keys, (prefix,))
+        end = bisect_left(self._keys, (prefix + "\U0010ffff",), lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+
+        return [username for _, username in self._keys[start:end]]
@@ -0,0 +1,430 @@
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Callable
+from uuid import UUID, uuid4
+
+from constants import ROSTER_CACHE_DIR
+
+from .client_event_helper import ClientEventHelper
+from .client_helper import ClientHelper, RowStream
+from .presence_debouncer import PendingPresence, PresenceDebouncer
+from .presence_sync import GAP_TIMEOUT, PresenceSequencer
+from .roster_cache import RosterCache
+from .tcp_client import TCPClient
+
+
+@dataclass
+class RosterChange:
+    # Người chơi mới online hoặc có stats thay đổi
+    updated: list[dict] = field(default_factory=list)
+    # Username của người chơi vừa offline
+    removed: list[str] = field(default_factory=list)
+    # Toàn bộ danh sách vừa được thay mới, listener nên đọc lại từ store
+    reset: bool = False
+
+
+type RosterListener = Callable[[RosterChange], None]
+
+# Thời gian gom các người chơi mới chưa có stats trước khi tải stats cho họ
+STATS_FETCH_DELAY = 0.5
+
+# Thời gian chờ trả lời đầu tiên của subscribePresence. Server cũ có thể bỏ
+# qua command lạ thay vì trả lỗi, khi đó store chuyển sang dùng event presence
+SUBSCRIBE_TIMEOUT = 5.0
+
+
+def _as_player(body) -> dict:
+    # Event presence có thể chỉ mang username hoặc cả object người chơi
+    if isinstance(body, dict):
+        return body
+
+    return {"username": body}
+
+
+def has_stats(player: dict) -> bool:
+    """False nếu mới chỉ biết username, stats của người chơi đang được tải"""
+    return len(player) > 1
+
+
+class RosterStore:
+    """
+    Danh sách người chơi online dùng chung cho mọi view của một phiên kết nối.
+
+    Store được đánh index theo username, tự cập nhật theo event presence và
+    báo thay đổi cho các listener. Event đến từ bridge thread được chuyển về
+    event loop đã tạo store trước khi áp dụng, nên listener luôn chạy trên
+    GUI thread. Các event đến dồn dập được gộp lại qua `PresenceDebouncer`.
+
+    Nếu server hỗ trợ `subscribePresence`, store nhận một snapshot có version
+    rồi áp dụng các delta theo đúng seq; chỉ tải lại snapshot khi phát hiện
+    mất delta. Với server cũ, store dùng event newUserOnline/userOffline.
+    """
+
+    def __init__(self, client: TCPClient) -> None:
+        self._client_helper = ClientHelper(client)
+        self._client_event_helper = ClientEventHelper(client)
+        self._single_flight = client.single_flight
+        self._loop = asyncio.get_running_loop()
+
+        self._players: dict[str, dict] = {}
+        # Stats cuối cùng đã biết, dùng lại khi người chơi online trở lại
+        self._known_players: dict[str, dict] = {}
+        self._listeners: dict[UUID, RosterListener] = {}
+
+        self.debouncer = PresenceDebouncer(self._loop, self._apply_presence)
+
+        # None: chưa biết server có hỗ trợ presence theo phiên bản hay không
+        self._sequenced: bool | None = None
+        self.sequencer = PresenceSequencer()
+        self._resync_task: asyncio.Task | None = None
+        self._gap_handle: asyncio.TimerHandle | None = None
+
+        # Người chơi mới online chỉ có username, chờ tải stats theo lô
+        self._missing_stats: set[str] = set()
+        self._stats_handle: asyncio.TimerHandle | None = None
+        self._stats_tasks: set[asyncio.Task] = set()
+
+        self._cache: RosterCache | None = None
+        self._cache_subscription: UUID | None = None
+        self._loading_cache = False
+
+        self._new_player_online_event = self._client_event_helper.on_new_player_online(
+            lambda body: self._loop.call_soon_threadsafe(self._on_player_online, body)
+        )
+        self._player_offline_event = self._client_event_helper.on_player_go_offline(
+            lambda body: self._loop.call_soon_threadsafe(self._on_player_offline, body)
+        )
+        self._presence_delta_event = self._client_event_helper.on_presence_delta(
+            lambda body: self._loop.call_soon_threadsafe(self._on_presence_delta, body)
+        )
+
+    def set_own_username(self, username: str):
+        """Thay đổi presence của chính người dùng được áp dụng ngay, không chờ gộp"""
+        self.debouncer.urgent_usernames = {username}
+
+    @property
+    def saved_refreshes(self) -> int:
+        return self.debouncer.saved_refreshes
+
+    def get(self, username: str) -> dict | None:
+        return self._players.get(username)
+
+    def players(self) -> list[dict]:
+        return list(self._players.values())
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._players
+
+    def __len__(self) -> int:
+        return len(self._players)
+
+    def subscribe(self, listener: RosterListener) -> UUID:
+        id = uuid4()
+        self._listeners[id] = listener
+        return id
+
+    def unsubscribe(self, id: UUID):
+        self._listeners.pop(id, None)
+
+    def _notify(self, change: RosterChange):
+        for listener in list(self._listeners.values()):
+            listener(change)
+
+    def attach_cache(self, cache: RosterCache):
+        """Ghi mọi thay đổi của store xuống cache trên đĩa"""
+        self._cache = cache
+        self._cache_subscription = self.subscribe(self._write_to_cache)
+
+    def _write_to_cache(self, change: RosterChange):
+        if self._loading_cache:
+            return
+
+        # Người chơi chưa có stats không được lưu, tránh ghi đè stats cũ bằng 0
+        players = [player for player in change.updated if has_stats(player)]
+        if players:
+            self._cache.save_players(players)
+        if change.removed:
+            self._cache.remove_players(change.removed)
+
+    async def load_cached(self, usernames: set[str] | None = None) -> int:
+        """
+        Nạp roster đã lưu trên đĩa để hiển thị ngay, trước khi có dữ liệu từ
+        server. Dữ liệu cũ sẽ được thay khi `refresh` chạy xong.
+
+        Args:
+            usernames: Chỉ nạp các người chơi này, None để nạp tất cả
+
+        Returns:
+            Số người chơi đã nạp từ cache
+        """
+        if self._cache is None:
+            return 0
+
+        players = await self._loop.run_in_executor(None, self._cache.load)
+        players = [
+            player
+            for player in players
+            if player["username"] not in self._players
+            and (usernames is None or player["username"] in usernames)
+        ]
+
+        for player in players:
+            self._players[player["username"]] = player
+
+        self._loading_cache = True
+        try:
+            if players:
+                self._notify(RosterChange(updated=players))
+        finally:
+            self._loading_cache = False
+
+        return len(players)
+
+    async def refresh(self):
+        """
+        Tải lại toàn bộ danh sách từ server. Khi đã đồng bộ theo delta, store
+        luôn mới nên không cần tải lại. Các lời gọi cùng lúc dùng chung một
+        lần tải (snapshot dạng stream không đi qua cache response).
+        """
+        await self._single_flight.do("roster.refresh", self._refresh)
+
+    async def _refresh(self):
+        if self._sequenced is None:
+            try:
+                await self._resync(SUBSCRIBE_TIMEOUT)
+                return
+            except ValueError as e:
+                print(f"[DEBUG] Sequenced presence unavailable, using events: {e}")
+                self._sequenced = False
+            except TimeoutError:
+                print(
+                    f"[DEBUG] No reply to subscribePresence after "
+                    f"{SUBSCRIBE_TIMEOUT}s, using events"
+                )
+                self._sequenced = False
+
+        if self._sequenced:
+            return
+
+        await self._apply_snapshot(self._client_helper.stream_online_players())
+
+    async def _resync(self, first_reply_timeout: float | None = None):
+        # Server chỉ gửi presenceDelta cho phiên đã đăng ký, các delta đến
+        # trước snapshot được giữ lại trong sequencer
+        self.sequencer.begin_resync()
+        snapshot = self._client_helper.stream_presence_snapshot(
+            first_reply_timeout=first_reply_timeout
+        )
+        await self._apply_snapshot(snapshot)
+        self._sequenced = True
+
+        # Các thay đổi đang chờ gộp đã có trong snapshot
+        self.debouncer.cancel()
+        self._apply_deltas(self.sequencer.reset(snapshot.body["version"]))
+        self._check_gap()
+
+    def _request_resync(self):
+        if self._resync_task is not None and not self._resync_task.done():
+            return
+
+        print(f"[DEBUG] Presence gap after version {self.sequencer.version}, resyncing")
+        self._resync_task = asyncio.ensure_future(self._resync())
+        self._resync_task.add_done_callback(self._on_resync_done)
+
+    def _on_resync_done(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[ERROR] Presence resync failed: {task.exception()}")
+
+    def _on_presence_delta(self, body: dict):
+        if self._sequenced is False:
+            return
+
+        self._apply_deltas(self.sequencer.push(body["seq"], body))
+        self._check_gap()
+
+    def _check_gap(self):
+        if self.sequencer.overflowed:
+            self._request_resync()
+            return
+
+        if not self.sequencer.has_gap:
+            if self._gap_handle is not None:
+                self._gap_handle.cancel()
+                self._gap_handle = None
+            return
+
+        if self._gap_handle is None:
+            # Chờ delta bị thiếu thêm một lúc, có thể nó chỉ đến muộn
+            self._gap_handle = self._loop.call_later(
+                GAP_TIMEOUT, self._on_gap_timeout, self.sequencer.version
+            )
+
+    def _on_gap_timeout(self, version: int):
+        self._gap_handle = None
+
+        if self.sequencer.has_gap and self.sequencer.version == version:
+            self._request_resync()
+        else:
+            self._check_gap()
+
+    def _apply_deltas(self, deltas: list[dict]):
+        for delta in deltas:
+            player = _as_player(delta["player"])
+
+            if delta["op"] == "offline":
+                self.debouncer.push(player["username"], None)
+            else:
+                self.debouncer.push(player["username"], player)
+
+    def update_player(self, player: dict):
+        """Ghi stats mới nhất của một người chơi đang online"""
+        self._apply_presence({player["username"]: player})
+
+    def invalidate(self):
+        """Đánh dấu dữ liệu trên server đã đổi (vd: sau khi kết thúc trận)"""
+        self._client_helper.invalidate_online_players()
+
+    async def _apply_snapshot(self, snapshot: RowStream):
+        """
+        Áp dụng snapshot theo từng lô ngay khi nhận được, listener thấy các
+        dòng đầu tiên trước khi cả danh sách tải xong. Người chơi không có
+        trong snapshot bị xoá khi snapshot kết thúc.
+        """
+        seen: set[str] = set()
+
+        async for batch in snapshot:
+            change = RosterChange()
+
+            for player in batch:
+                username = player["username"]
+                seen.add(username)
+
+                if self._players.get(username) != player:
+                    self._players[username] = player
+                    change.updated.append(player)
+
+            if change.updated:
+                self._notify(change)
+
+        change = RosterChange(
+            removed=[username for username in self._players if username not in seen]
+        )
+        for username in change.removed:
+            self._known_players[username] = self._players.pop(username)
+
+        if change.removed:
+            self._notify(change)
+
+    def _on_player_online(self, body):
+        if self._sequenced:
+            return
+
+        self.debouncer.push(_as_player(body)["username"], body)
+
+    def _on_player_offline(self, body):
+        if self._sequenced:
+            return
+
+        self.debouncer.push(_as_player(body)["username"], None)
+
+    def _apply_presence(self, pending: PendingPresence):
+        change = RosterChange()
+
+        for username, body in pending.items():
+            if body is None:
+                player = self._players.pop(username, None)
+                if player is not None:
+                    self._known_players[username] = player
+                    change.removed.append(username)
+                continue
+
+            player = _as_player(body)
+            if not has_stats(player):
+                # Event chỉ có username: dùng stats đã biết nếu có
+                player = self._players.get(username) or self._known_players.get(
+                    username, player
+                )
+
+            if not has_stats(player):
+                self._request_stats(username)
+
+            self._players[username] = player
+            change.updated.append(player)
+
+        if change.updated or change.removed:
+            self._notify(change)
+
+    def _request_stats(self, username: str):
+        self._missing_stats.add(username)
+
+        if self._stats_handle is None:
+            self._stats_handle = self._loop.call_later(
+                STATS_FETCH_DELAY, self._start_stats_fetch
+            )
+
+    def _start_stats_fetch(self):
+        self._stats_handle = None
+        usernames, self._missing_stats = self._missing_stats, set()
+
+        task = asyncio.ensure_future(self._fetch_stats(usernames))
+        self._stats_tasks.add(task)
+        task.add_done_callback(self._stats_tasks.discard)
+
+    async def _fetch_stats(self, usernames: set[str]):
+        """Tải stats cho cả lô người chơi mới bằng một request listOnline"""
+        try:
+            players = await self._client_helper.get_online_players()
+        except Exception as e:
+            print(f"[ERROR] Cannot load stats of new players: {e}")
+            return
+
+        found = {}
+        for player in players:
+            username = player["username"]
+            current = self._players.get(username)
+
+            # Chỉ điền cho người chơi vẫn online và vẫn chưa có stats
+            if username in usernames and current is not None and not has_stats(current):
+                found[username] = player
+
+        if found:
+            self._apply_presence(found)
+
+    def close(self):
+        self.debouncer.cancel()
+        if self._stats_handle is not None:
+            self._stats_handle.cancel()
+        for task in self._stats_tasks:
+            task.cancel()
+        if self._gap_handle is not None:
+            self._gap_handle.cancel()
+        if self._resync_task is not None:
+            self._resync_task.cancel()
+
+        self._client_event_helper.remove_event(self._presence_delta_event)
+
+        if self._cache is not None:
+            self.unsubscribe(self._cache_subscription)
+            self._cache.close()
+        self._client_event_helper.remove_event(self._new_player_online_event)
+        self._client_event_helper.remove_event(self._player_offline_event)
+        self._listeners.clear()
+
+
+def get_roster_store(client: TCPClient) -> RosterStore:
+    """
+    Lấy roster store của phiên kết nối, tạo mới nếu chưa có.
+    Lần gọi đầu tiên phải ở trong GUI event loop.
+    """
+    if client.roster_store is None:
+        client.roster_store = RosterStore(client)
+
+        if ROSTER_CACHE_DIR:
+            host, port = client.address
+            path = os.path.join(
+                os.path.expanduser(ROSTER_CACHE_DIR), f"roster_{host}_{port}.sqlite3"
+            )
+            client.roster_store.attach_cache(RosterCache(path))
+
+    return client.roster_store
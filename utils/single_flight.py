@@ -0,0 +1,95 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
+from threading import Lock
+
+# Giữ reference tới các request đang chạy để không bị GC giữa chừng
+_running: set[asyncio.Task] = set()
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.future: Future = Future()
+        self.task: asyncio.Task | None = None
+
+        # Số lời gọi còn đang chờ kết quả
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Gộp các lời gọi giống nhau (cùng key) đang chạy thành một.
+
+    Lời gọi đầu tiên chạy `factory` thành một task riêng trên loop của nó,
+    mọi lời gọi (kể cả lời gọi đầu tiên) chỉ chờ chung kết quả. Huỷ một lời
+    gọi không ảnh hưởng tới những người khác, task chỉ bị huỷ khi không còn
+    ai chờ. Future dùng chung là `concurrent.futures.Future` nên người gọi có
+    thể ở event loop khác (vd: trong `sync_await`).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._in_flight: dict[str, _Flight] = {}
+
+        # Số lời gọi đã được gộp vào một request đang chạy
+        self.deduplicated = 0
+
+    async def do[T](self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        with self._lock:
+            flight = self._in_flight.get(key)
+            is_leader = flight is None
+
+            if is_leader:
+                flight = self._in_flight[key] = _Flight()
+            else:
+                self.deduplicated += 1
+
+            flight.waiters += 1
+
+        if is_leader:
+            flight.task = asyncio.ensure_future(self._run(key, flight, factory))
+            _running.add(flight.task)
+            flight.task.add_done_callback(_running.discard)
+
+        try:
+            # shield để việc huỷ một người chờ không huỷ kết quả dùng chung
+            return await asyncio.shield(asyncio.wrap_future(flight.future))
+
+        except asyncio.CancelledError:
+            self._leave(key, flight)
+            raise
+
+    def _leave(self, key: str, flight: _Flight):
+        with self._lock:
+            flight.waiters -= 1
+            abandoned = flight.waiters == 0
+
+            # Lời gọi mới cùng key sẽ chạy request mới thay vì chờ task bị huỷ
+            if abandoned and self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+
+        if abandoned and flight.task is not None:
+            try:
+                flight.task.get_loop().call_soon_threadsafe(flight.task.cancel)
+            except RuntimeError:
+                # Loop của task đã đóng, task không còn chạy nữa
+                pass
+
+    async def _run(self, key: str, flight: _Flight, factory: Callable[[], Awaitable]):
+        try:
+            result = await factory()
+
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+
+        except Exception as e:
+            flight.future.set_exception(e)
+
+        else:
+            flight.future.set_result(result)
+
+        finally:
+            with self._lock:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
@@ -0,0 +1,112 @@
+from bisect import bisect_left, insort
+
+# Số trận "ảo" 50/50 cộng thêm khi tính tỉ lệ thắng, để người mới chơi vài
+# trận không bị xếp như cao thủ (hoặc người mới hoàn toàn)
+PRIOR_MATCHES = 10
+# Trọng số của điểm trung bình mỗi trận so với tỉ lệ thắng (%)
+AVERAGE_SCORE_WEIGHT = 0.1
+
+
+def skill_of(player: dict) -> float:
+    """
+    Độ mạnh ước lượng của người chơi: tỉ lệ thắng đã làm mượt theo số trận,
+    cộng một phần nhỏ điểm trung bình mỗi trận.
+    """
+    matches = player.get("totalMatches", 0)
+    wins = player.get("wins", 0)
+
+    win_rate = 100 * (wins + PRIOR_MATCHES / 2) / (matches + PRIOR_MATCHES)
+    average_score = player.get("totalScore", 0) / matches if matches else 0
+
+    return win_rate + AVERAGE_SCORE_WEIGHT * average_score
+
+
+class SkillIndex:
+    """
+    Index người chơi theo `skill_of`, dùng để tìm đối thủ cân sức.
+
+    Các cặp (skill, username) được giữ trong một mảng đã sắp xếp; tìm k người
+    gần nhất tốn O(log n + k).
+    """
+
+    def __init__(self, players=()) -> None:
+        self._skills: dict[str, float] = {
+            player["username"]: skill_of(player) for player in players
+        }
+        self._keys: list[tuple[float, str]] = sorted(
+            (skill, username) for username, skill in self._skills.items()
+        )
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, username: str) -> bool:
+        return username in self._skills
+
+    def skill(self, username: str) -> float | None:
+        return self._skills.get(username)
+
+    def update(self, player: dict):
+        username = player["username"]
+        skill = skill_of(player)
+
+        old = self._skills.get(username)
+        if old == skill:
+            return
+
+        if old is not None:
+            del self._keys[bisect_left(self._keys, (old, username))]
+
+        self._skills[username] = skill
+        insort(self._keys, (skill, username))
+
+    def update_many(self, players: list[dict]):
+        """Cập nhật một lô người chơi, lô lớn được sắp xếp lại một lần"""
+        if len(players) * 8 < len(self._keys):
+            for player in players:
+                self.update(player)
+            return
+
+        for player in players:
+            self._skills[player["username"]] = skill_of(player)
+        self._keys = sorted(
+            (skill, username) for username, skill in self._skills.items()
+        )
+
+    def remove(self, username: str):
+        skill = self._skills.pop(username, None)
+        if skill is not None:
+            del self._keys[bisect_left(self._keys, (skill, username))]
+
+    def nearest(
+        self, skill: float, k: int, exclude: str | None = None
+    ) -> list[tuple[str, float]]:
+        """
+        k người chơi có skill gần `skill` nhất, gần nhất trước.
+
+        Returns:
+            Danh sách (username, skill)
+        """
+        keys = self._keys
+        result = []
+
+        # Mở rộng dần hai phía từ vị trí của `skill` trong mảng
+        right = bisect_left(keys, (skill,))
+        left = right - 1
+
+        while len(result) < k and (left >= 0 or right < len(keys)):
+            take_right = left < 0 or (
+                right < len(keys) and keys[right][0] - skill <= skill - keys[left][0]
+            )
+
+            if take_right:
+                other_skill, username = keys[right]
+                right += 1
+            else:
+                other_skill, username = keys[left]
+                left -= 1
+
+            if username != exclude:
+                result.append((username, other_skill))
+
+        return result
@@ -0,0 +1,136 @@
+"""
+Phát hiện GUI event loop bị treo (stall).
+
+Một coroutine chạy trên GUI loop cập nhật heartbeat định kỳ; một thread riêng
+theo dõi heartbeat đó. Khi heartbeat trễ quá ngưỡng, thread chụp stack hiện tại
+của GUI thread để biết đoạn code nào đang chặn loop.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+
+# Số frame cuối của stack dùng để gộp các lần stall giống nhau
+_STACK_DEPTH = 8
+
+
+@dataclass
+class _StallStats:
+    count: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+
+
+class StallWatchdog:
+    def __init__(self, threshold: float = 0.1, interval: float = 0.02) -> None:
+        """
+        Args:
+            threshold: Thời gian loop không phản hồi (giây) để coi là stall
+            interval: Chu kỳ heartbeat (giây)
+        """
+        self._threshold = threshold
+        self._interval = interval
+
+        self._heartbeat = time.monotonic()
+        self._gui_thread_id: int | None = None
+        self._stop = threading.Event()
+
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+
+        # Độ trễ lớn nhất đo được từ phía loop (giây)
+        self.max_lag = 0.0
+        self.stalls: dict[tuple[str, ...], _StallStats] = {}
+
+    def start(self):
+        """Phải được gọi từ GUI thread, trong lúc loop đang chạy"""
+        self._gui_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+
+        self._task = asyncio.ensure_future(self._beat())
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+        if self._task is not None:
+            self._task.cancel()
+
+        if self._thread is not None:
+            self._thread.join()
+
+    async def _beat(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            expected = loop.time() + self._interval
+            self._heartbeat = time.monotonic()
+
+            await asyncio.sleep(self._interval)
+
+            self.max_lag = max(self.max_lag, loop.time() - expected)
+
+    def _capture_gui_stack(self) -> tuple[str, ...]:
+        frame = sys._current_frames().get(self._gui_thread_id)
+        if frame is None:
+            return ("<unknown>",)
+
+        stack = traceback.extract_stack(frame)[-_STACK_DEPTH:]
+        return tuple(
+            f"{summary.filename}:{summary.lineno} in {summary.name}"
+            for summary in stack
+        )
+
+    def _watch(self):
+        stall_start: float | None = None
+        stall_stack: tuple[str, ...] = ()
+
+        while not self._stop.wait(self._interval):
+            heartbeat = self._heartbeat
+            lag = time.monotonic() - heartbeat
+
+            if stall_start is None:
+                if lag > self._threshold:
+                    stall_start = heartbeat
+                    stall_stack = self._capture_gui_stack()
+                continue
+
+            # Loop đã chạy lại: ghi nhận tổng thời gian của lần stall vừa rồi
+            if heartbeat != stall_start:
+                duration = heartbeat - stall_start - self._interval
+                self._record(stall_stack, duration)
+                stall_start = None
+
+        # Loop vẫn đang treo lúc dừng watchdog
+        if stall_start is not None:
+            self._record(stall_stack, time.monotonic() - stall_start)
+
+    def _record(self, stack: tuple[str, ...], duration: float):
+        stats = self.stalls.setdefault(stack, _StallStats())
+        stats.count += 1
+        stats.total += duration
+        stats.worst = max(stats.worst, duration)
+
+    def report(self, limit: int = 5) -> str:
+        """Tóm tắt các stack gây stall nặng nhất, sắp theo tổng thời gian"""
+        lines = [
+            f"[Watchdog] {sum(s.count for s in self.stalls.values())} stall(s) "
+            f"> {self._threshold * 1000:.0f}ms, "
+            f"max loop lag {self.max_lag * 1000:.0f}ms"
+        ]
+
+        offenders = sorted(
+            self.stalls.items(), key=lambda item: item[1].total, reverse=True
+        )
+        for stack, stats in offenders[:limit]:
+            lines.append(
+                f"  {stats.count}x, total {stats.total * 1000:.0f}ms, "
+                f"worst {stats.worst * 1000:.0f}ms:"
+            )
+            lines.extend(f"    {frame}" for frame in stack)
+
+        return "\n".join(lines)
@@ -1,20 +1,33 @@
 import asyncio
 import json
 import socket
-from threading import Lock, Thread
-from typing import Callable
+from threading import Thread
+from typing import AsyncIterator
 from uuid import UUID, uuid4
 
-type _Callback = Callable[[dict], None]
+from .callback_registry import Callback, CallbackRegistry
+from .response_cache import ResponseCache
+from .single_flight import SingleFlight
 
 
 class TCPClient:
     def __init__(self, address: tuple[str, int]):
         self.fp_lock = asyncio.Lock()
-        self.callbacks_lock = Lock()
 
         self._address = address
-        self.queue_callbacks: dict[UUID, _Callback] = {}
+        self.callbacks = CallbackRegistry()
+
+        # Dùng chung cho mọi ClientHelper của phiên kết nối này
+        self.single_flight = SingleFlight()
+        self.response_cache = ResponseCache()
+        self.add_callback(self.response_cache.on_message)
+
+        # Được tạo khi cần bởi utils.roster_store.get_roster_store
+        self.roster_store = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self._address
 
     def __enter__(self):
         self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -46,13 +59,13 @@ class TCPClient:
             if len(message) == 0:
                 return
 
-            print("[Server]", message, end="")
             json_object = json.loads(message)
 
-            with self.callbacks_lock:
-                callbacks = list(self.queue_callbacks.values())
+            # Không in từng dòng của response dạng stream (có thể hàng chục nghìn dòng)
+            if "row" not in json_object:
+                print("[Server]", message, end="")
 
-            for callback in callbacks:
+            for callback in self.callbacks.snapshot:
                 callback(json_object)
 
     def get_fp(self):
@@ -61,17 +74,11 @@ class TCPClient:
 
         return self.fp
 
-    def add_callback(self, callback: Callable, id: UUID | None = None) -> UUID:
-        if id is None:
-            id = uuid4()
-
-        self.queue_callbacks[id] = callback
-
-        return id
+    def add_callback(self, callback: Callback, id: UUID | None = None) -> UUID:
+        return self.callbacks.add(callback, id)
 
     def remove_callback(self, id: UUID):
-        with self.callbacks_lock:
-            self.queue_callbacks.pop(id)
+        self.callbacks.remove(id)
 
     async def write_object(self, obj: dict):
         fp = self.get_fp()
@@ -92,6 +99,11 @@ class TCPClient:
         id = uuid4()
         obj["id"] = str(id)
 
+        def resolve(response: dict):
+            # Người gọi có thể đã huỷ việc chờ trước khi response tới
+            if not future.done():
+                future.set_result(response)
+
         def callback(response: dict):
             if "id" not in response:
                 return
@@ -99,10 +111,52 @@ class TCPClient:
             if UUID(response["id"]) != id:
                 return
 
-            loop.call_soon_threadsafe(future.set_result, response)
+            loop.call_soon_threadsafe(resolve, response)
             self.remove_callback(id)
 
         self.add_callback(callback, id)
 
-        await self.write_object(obj)
-        return await future
+        try:
+            await self.write_object(obj)
+            return await future
+        finally:
+            # Khi bị huỷ, response tới sau sẽ không còn ai nhận
+            self.remove_callback(id)
+
+    async def send_stream(self, obj: dict) -> AsyncIterator[dict]:
+        """
+        Gửi một request có response dạng stream: server trả từng dòng
+        `{"id", "row"}` rồi kết thúc bằng một response thường `{"id", "ok", ...}`.
+
+        Mỗi message được decode riêng ngay khi tới, không cần chờ cả response.
+        Message kết thúc cũng được yield, sau đó generator dừng.
+
+        Bridge thread không bao giờ chờ người đọc: message được đưa vào một
+        queue không giới hạn trên loop, nên response của các request khác trên
+        cùng kết nối (kể cả `sync_await` từ GUI thread) vẫn được chuyển đi
+        trong lúc stream đang được duyệt.
+        """
+        loop = asyncio.get_running_loop()
+        messages: asyncio.Queue[dict] = asyncio.Queue()
+
+        id = uuid4()
+        obj["id"] = str(id)
+
+        def callback(message: dict):
+            if message.get("id") != obj["id"]:
+                return
+
+            loop.call_soon_threadsafe(messages.put_nowait, message)
+
+        self.add_callback(callback, id)
+        try:
+            await self.write_object(obj)
+
+            while True:
+                message = await messages.get()
+                yield message
+
+                if "row" not in message:
+                    return
+        finally:
+            self.remove_callback(id)
@@ -0,0 +1,109 @@
+import asyncio
+from collections import OrderedDict
+from typing import Callable
+
+from .client_helper import ClientHelper
+
+# (username, available), available là None nếu không kiểm tra được
+type AvailabilityCallback = Callable[[str, bool | None], None]
+
+# Server cũ có thể không bao giờ trả lời checkUsername
+CHECK_TIMEOUT = 5.0
+
+
+class UsernameAvailability:
+    """
+    Kiểm tra username còn trống trong lúc người dùng gõ.
+
+    Mỗi lần gọi `check` huỷ lần kiểm tra trước (kể cả khi request đang chờ
+    server) và chỉ gửi request sau `delay` giây không gõ thêm. Các câu trả lời
+    gần đây được giữ trong một LRU nhỏ. Kết quả chỉ mang tính gợi ý, `register`
+    vẫn là nơi quyết định cuối cùng.
+    """
+
+    def __init__(
+        self, client_helper: ClientHelper, delay: float = 0.3, max_size: int = 64
+    ) -> None:
+        self._client_helper = client_helper
+        self.delay = delay
+        self._max_size = max_size
+
+        self._answers: OrderedDict[str, bool] = OrderedDict()
+        self._task: asyncio.Task | None = None
+
+        # False khi server không hỗ trợ command checkUsername
+        self.supported = True
+        # True khi server đã trả lời checkUsername ít nhất một lần
+        self._confirmed = False
+        self.requests = 0
+
+    def cached(self, username: str) -> bool | None:
+        available = self._answers.get(username)
+        if available is not None:
+            self._answers.move_to_end(username)
+
+        return available
+
+    def remember(self, username: str, available: bool):
+        self._answers[username] = available
+        self._answers.move_to_end(username)
+
+        while len(self._answers) > self._max_size:
+            self._answers.popitem(last=False)
+
+    def cancel(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def check(self, username: str, on_result: AvailabilityCallback):
+        """
+        Hẹn kiểm tra `username`, `on_result(username, available)` được gọi
+        trên event loop khi có kết quả. Không gọi gì nếu bị huỷ.
+        """
+        self.cancel()
+
+        available = self.cached(username)
+        if available is not None:
+            on_result(username, available)
+            return
+
+        if not self.supported:
+            return
+
+        self._task = asyncio.ensure_future(self._check_later(username, on_result))
+
+    async def _check_later(self, username: str, on_result: AvailabilityCallback):
+        await asyncio.sleep(self.delay)
+
+        self.requests += 1
+        try:
+            available = await asyncio.wait_for(
+                self._client_helper.check_username(username), CHECK_TIMEOUT
+            )
+        except TimeoutError:
+            if self._confirmed:
+                print(f"[ERROR] No reply to checkUsername after {CHECK_TIMEOUT}s")
+            else:
+                print(
+                    f"[DEBUG] No reply to checkUsername after {CHECK_TIMEOUT}s, "
+                    "availability check disabled"
+                )
+                self.supported = False
+            available = None
+        except ValueError as e:
+            print(f"[DEBUG] Username availability check disabled: {e}")
+            self.supported = False
+            available = None
+        except Exception as e:
+            print(f"[ERROR] Username availability check failed: {e}")
+            available = None
+
+        self._task = None
+        if available is None:
+            on_result(username, None)
+            return
+
+        self._confirmed = True
+        self.remember(username, available)
+        on_result(username, available)
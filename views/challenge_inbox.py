@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any, Literal
+
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtWidgets import (
+    QGroupBox,
+    QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QPushButton,
+    QVBoxLayout,
+    QWidget,
+)
+from qasync import asyncSlot
+from utils.client_event_helper import ClientEventHelper
+from utils.client_helper import ClientHelper
+from utils.tcp_client import TCPClient
+
+
+class ChallengeInbox(QGroupBox):
+    """
+    Hộp lời thách đấu không modal.
+
+    Các lời thách đấu đến được xếp hàng và hiển thị cùng lúc, tự biến mất khi
+    bên gửi huỷ, và được trả lời bất đồng bộ nên lobby vẫn cập nhật bình thường
+    trong lúc chờ người chơi quyết định.
+    """
+
+    # Phát ra khi bắt đầu chấp nhận, trước khi server trả lời
+    challenge_accepting: Any = pyqtSignal(str)
+    # Phát ra khi server đã nhận lời chấp nhận
+    challenge_accepted: Any = pyqtSignal(str)
+
+    def __init__(self, client: TCPClient):
+        super().__init__("📨 Lời thách đấu")
+
+        self._client_helper = ClientHelper(client)
+        self._client_event_helper = ClientEventHelper(client)
+
+        # challenge_id -> (username người gửi, item trong danh sách)
+        self._pending: dict[int, tuple[str, QListWidgetItem]] = {}
+
+        # Người gửi của lời thách đấu đang chờ server xác nhận chấp nhận
+        self._accepting: str | None = None
+
+        self._list = QListWidget()
+        self._status_label = QLabel()
+        self._status_label.setStyleSheet("color: #d32f2f;")
+        self._status_label.hide()
+
+        layout = QVBoxLayout()
+        layout.addWidget(self._list)
+        layout.addWidget(self._status_label)
+        self.setLayout(layout)
+        self.hide()
+
+        self._new_challenges = self._client_event_helper.stream("newChallenger")
+        self._canceled_challenges = self._client_event_helper.stream(
+            "challengeCanceled"
+        )
+        self._tasks = [
+            asyncio.ensure_future(self._consume_new_challenges()),
+            asyncio.ensure_future(self._consume_canceled_challenges()),
+        ]
+
+    async def _consume_new_challenges(self):
+        async for body in self._new_challenges:
+            self._add_challenge(body["from"], body["challengeId"])
+
+    async def _consume_canceled_challenges(self):
+        async for body in self._canceled_challenges:
+            challenge_id = body.get("challengeId") if isinstance(body, dict) else body
+            self._remove_challenge(challenge_id)
+
+    def _add_challenge(self, from_username: str, challenge_id: int):
+        if challenge_id in self._pending:
+            return
+
+        accept_button = QPushButton("Chấp nhận")
+        accept_button.setStyleSheet("background-color: #4CAF50; color: white;")
+        accept_button.clicked.connect(
+            lambda checked=False, c=challenge_id: self.accept(c)
+        )
+
+        decline_button = QPushButton("Từ chối")
+        decline_button.setStyleSheet("background-color: #f44336; color: white;")
+        decline_button.clicked.connect(
+            lambda checked=False, c=challenge_id: self.decline(c)
+        )
+
+        row_layout = QHBoxLayout()
+        row_layout.setContentsMargins(4, 2, 4, 2)
+        row_layout.addWidget(QLabel(f"⚔️ {from_username} thách đấu bạn"))
+        row_layout.addStretch(1)
+        row_layout.addWidget(accept_button)
+        row_layout.addWidget(decline_button)
+
+        row = QWidget()
+        row.setLayout(row_layout)
+
+        item = QListWidgetItem()
+        item.setSizeHint(row.sizeHint())
+        self._list.addItem(item)
+        self._list.setItemWidget(item, row)
+
+        self._pending[challenge_id] = (from_username, item)
+        self._status_label.hide()
+        self.show()
+
+    def _remove_challenge(self, challenge_id: int) -> str | None:
+        pending = self._pending.pop(challenge_id, None)
+        if pending is None:
+            return None
+
+        from_username, item = pending
+        self._list.takeItem(self._list.row(item))
+
+        if not self._pending and self._status_label.isHidden():
+            self.hide()
+
+        return from_username
+
+    def take_accepting(self) -> str | None:
+        """
+        Lấy (và xoá) người gửi của lời thách đấu đang được chấp nhận, dùng khi
+        startGame đến trước response của lời chấp nhận. Khi đã bị lấy,
+        `challenge_accepted` không được phát nữa.
+        """
+        accepting, self._accepting = self._accepting, None
+        return accepting
+
+    async def _answer(
+        self, challenge_id: int, new_status: Literal["accepted", "declined"]
+    ) -> bool:
+        try:
+            await self._client_helper.answer_challenge(challenge_id, new_status)
+        except Exception as e:
+            print(f"Lỗi khi trả lời thách đấu: {e}")
+            self._status_label.setText(f"Không thể trả lời thách đấu: {e}")
+            self._status_label.show()
+            self.show()
+            return False
+
+        return True
+
+    @asyncSlot()
+    async def accept(self, challenge_id: int):
+        from_username = self._remove_challenge(challenge_id)
+        if from_username is None:
+            return
+
+        self._accepting = from_username
+        self.challenge_accepting.emit(from_username)
+
+        # Chỉ nhận một trận, từ chối các lời thách đấu còn lại
+        others = list(self._pending)
+        for other_id in others:
+            self._remove_challenge(other_id)
+
+        accepted, *_ = await asyncio.gather(
+            self._answer(challenge_id, "accepted"),
+            *(self._answer(other_id, "declined") for other_id in others),
+        )
+
+        if self._accepting != from_username:
+            # Trận đã bắt đầu và view đã lấy đối thủ qua take_accepting
+            return
+
+        self._accepting = None
+        if accepted:
+            self.challenge_accepted.emit(from_username)
+
+    @asyncSlot()
+    async def decline(self, challenge_id: int):
+        if self._remove_challenge(challenge_id) is None:
+            return
+
+        await self._answer(challenge_id, "declined")
+
+    def cleanup(self):
+        self._new_challenges.close()
+        self._canceled_challenges.close()
@@ -0,0 +1,95 @@
+from PyQt5.QtWidgets import (
+    QAbstractItemView,
+    QGroupBox,
+    QHeaderView,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+)
+from utils.leaderboard import TopKLeaderboard
+from utils.roster_store import RosterChange, RosterStore, has_stats
+
+from .player_table_model import rank_key
+
+HEADERS = ["#", "Tên", "Thắng", "Điểm"]
+
+
+def _row_texts(rank: int, player: dict) -> tuple[str, ...]:
+    if not has_stats(player):
+        return str(rank), player["username"], "…", "…"
+
+    return (
+        str(rank),
+        player["username"],
+        f"{player.get('wins', 0)} ({player.get('winRate', 0)}%)",
+        str(player.get("totalScore", 0)),
+    )
+
+
+class LeaderboardPanel(QGroupBox):
+    """
+    Bảng xếp hạng top k người chơi online, cùng thứ tự với bảng lobby.
+
+    Top k được giữ bởi `TopKLeaderboard` và cập nhật theo từng thay đổi của
+    roster store; chỉ các dòng có nội dung thay đổi được vẽ lại.
+    """
+
+    def __init__(self, roster: RosterStore, k: int = 10):
+        super().__init__(f"🏆 Top {k}")
+
+        self._roster = roster
+        self._leaderboard = TopKLeaderboard(k, rank_key)
+        self._leaderboard.reset(roster.players())
+
+        # Nội dung đang hiển thị của từng dòng, để chỉ vẽ lại dòng thay đổi
+        self._rendered: list[tuple[str, ...]] = []
+
+        self._table = QTableWidget(0, len(HEADERS))
+        self._table.setHorizontalHeaderLabels(HEADERS)
+        self._table.verticalHeader().hide()
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.setSelectionMode(QAbstractItemView.NoSelection)
+        self._table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self._table.setColumnWidth(0, 30)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self._table)
+        self.setLayout(layout)
+
+        self._roster_subscription = roster.subscribe(self._on_roster_changed)
+        self._render()
+
+    def _on_roster_changed(self, change: RosterChange):
+        if change.reset:
+            self._leaderboard.reset(self._roster.players())
+        else:
+            for username in change.removed:
+                self._leaderboard.remove(username)
+
+            for player in change.updated:
+                self._leaderboard.update(player)
+
+        self._render()
+
+    def _render(self):
+        rows = [
+            _row_texts(rank, self._roster.get(username) or {"username": username})
+            for rank, username in enumerate(self._leaderboard.top(), start=1)
+        ]
+
+        if len(rows) != len(self._rendered):
+            self._table.setRowCount(len(rows))
+
+        for row, texts in enumerate(rows):
+            old = self._rendered[row] if row < len(self._rendered) else ()
+
+            for column, text in enumerate(texts):
+                if column < len(old) and old[column] == text:
+                    continue
+
+                self._table.setItem(row, column, QTableWidgetItem(text))
+
+        self._rendered = rows
+
+    def cleanup(self):
+        self._roster.unsubscribe(self._roster_subscription)
@@ -1,39 +1,95 @@
-from threading import Lock
-from typing import Any
-
+import asyncio
+import time
+from typing import Any, override
+
+from constants import (
+    LOBBY_PAGE_SIZE,
+    QUICK_MATCH_CANDIDATES,
+    QUICK_MATCH_CHALLENGE_TIMEOUT,
+    QUICK_MATCH_PENDING_EXPIRY,
+    QUICK_MATCH_TIMEOUT,
+)
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (
+    QAbstractItemView,
     QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
     QMessageBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 from qasync import asyncSlot
 from utils.client_event_helper import ClientEventHelper
 from utils.client_helper import ClientHelper
-from utils.sync_await import sync_await
+from utils.quick_match import QuickMatch
+from utils.roster_store import RosterChange, get_roster_store
 from utils.tcp_client import TCPClient
 
+from .challenge_inbox import ChallengeInbox
+from .leaderboard_panel import LeaderboardPanel
+from .opponent_suggestions import OpponentSuggestions
+from .player_table_model import (
+    CHALLENGE_COLUMN,
+    ChallengeButtonDelegate,
+    PagedPlayerTableModel,
+    PlayerTableModel,
+)
 
-class PlayerTable(QTableWidget):
-    new_player_signal: Any = pyqtSignal(dict)
-    player_offline_signal: Any = pyqtSignal(dict)
 
-    def __init__(self, client: TCPClient, username: str, on_challenge_sent=None):
+class PlayerTable(QTableView):
+    def __init__(
+        self,
+        client: TCPClient,
+        username: str,
+        on_challenge_sent=None,
+        page_size: int = 0,
+        on_challenge_sending=None,
+    ):
+        """
+        Args:
+            on_challenge_sending: Gọi với username ngay trước khi gửi lời
+                thách đấu, trước cả khi server trả lời
+            page_size: Nếu > 0, chỉ tải từng trang người chơi khi cuộn tới
+                thay vì tải cả danh sách
+        """
         super().__init__()
         self._current_username = username
         self._on_challenge_sent = on_challenge_sent
+        self._on_challenge_sending = on_challenge_sending
 
         self._client_helper = ClientHelper(client)
-        self._client_event_helper = ClientEventHelper(client)
+        self._roster = get_roster_store(client)
 
-        self.setColumnCount(6)
-        self.setHorizontalHeaderLabels(
-            ["Tên", "Trận", "Thắng", "Thua", "Điểm", "Thách đấu"]
+        if page_size > 0:
+            self._model = PagedPlayerTableModel(
+                self._client_helper, username, page_size, self
+            )
+            # Tải trước trang kế tiếp khi còn nửa trang nữa là tới cuối
+            self.verticalScrollBar().valueChanged.connect(self._prefetch_next_page)
+        else:
+            self._model = PlayerTableModel(self)
+        self.setModel(self._model)
+
+        # Nút thách đấu được vẽ bởi delegate, không tạo widget cho từng dòng
+        self._challenge_delegate = ChallengeButtonDelegate(self)
+        self._challenge_delegate.clicked.connect(
+            lambda index: self.send_challenge(
+                self._model.player_at(index.row())["username"]
+            )
         )
+        self.setItemDelegateForColumn(CHALLENGE_COLUMN, self._challenge_delegate)
+        self.setMouseTracking(True)
+
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+        # Chiều cao dòng cố định để view không phải đo từng dòng
+        self.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+
         # Set column widths
         self.setColumnWidth(0, 120)  # Username
         self.setColumnWidth(1, 50)  # Total matches
@@ -42,98 +98,93 @@ class PlayerTable(QTableWidget):
         self.setColumnWidth(4, 70)  # Score
         self.setColumnWidth(5, 100)  # Challenge button
 
-        self._table_lock = Lock()
-        self._table_content: set[str] = set()
-
-        self._new_player_online_event = self._client_event_helper.on_new_player_online(
-            lambda player: self.new_player_signal.emit(player)
-        )
-
-        self._player_offline_event = self._client_event_helper.on_player_go_offline(
-            lambda player: self.player_offline_signal.emit(player)
-        )
+        self._roster_subscription = self._roster.subscribe(self._on_roster_changed)
+        self.reload()
 
-        self.new_player_signal.connect(self._on_new_player)
-        self.player_offline_signal.connect(self._on_player_offline)
+    @property
+    def is_paged(self) -> bool:
+        return isinstance(self._model, PagedPlayerTableModel)
 
-        self._init_content()
-
-    def _refresh_content(self, players: list[dict]):
-        self.setRowCount(len(players))
+    def reload(self):
+        """Đồng bộ lại toàn bộ bảng"""
+        if self.is_paged:
+            self._model.reload()
+        else:
+            self._sync_with_roster()
 
-        for index, player in enumerate(players):
-            username = player["username"]
-            total_matches = player.get("totalMatches", 0)
-            wins = player.get("wins", 0)
-            losses = player.get("losses", 0)
-            total_score = player.get("totalScore", 0)
-            win_rate = player.get("winRate", 0)
+    def set_search_prefix(self, prefix: str):
+        """Lọc bảng theo tiền tố username (search-as-you-type)"""
+        self._model.set_prefix(prefix)
 
-            challenge_button = QPushButton("Thách đấu")
-            challenge_button.clicked.connect(
-                lambda checked=False, u=username: self.send_challenge(u),
-            )
+    def _prefetch_next_page(self, value: int):
+        scroll_bar = self.verticalScrollBar()
+        if scroll_bar.maximum() - value < self._model.page_size // 2:
+            self._model.fetchMore()
 
-            # Set player info
-            self.setItem(index, 0, QTableWidgetItem(username))
-            self.setItem(index, 1, QTableWidgetItem(str(total_matches)))
-            self.setItem(index, 2, QTableWidgetItem(f"{wins} ({win_rate}%)"))
-            self.setItem(index, 3, QTableWidgetItem(str(losses)))
-            self.setItem(index, 4, QTableWidgetItem(str(total_score)))
-            self.setCellWidget(index, 5, challenge_button)
+    def update_player(self, player: dict):
+        """Thêm hoặc cập nhật một người chơi mà không dựng lại cả bảng"""
+        if player["username"] == self._current_username:
+            return
 
-            # Center align numeric columns
-            for col in [1, 2, 3, 4]:
-                item = self.item(index, col)
-                if item:
-                    item.setTextAlignment(4 | 128)  # AlignCenter
+        self._model.update_player(player)
 
     @asyncSlot()
     async def send_challenge(self, username: str):
+        if self._on_challenge_sending:
+            self._on_challenge_sending(username)
+
         await self._client_helper.send_challenge(username)
         if self._on_challenge_sent:
             self._on_challenge_sent(username)
 
-    def _init_content(self):
-        online_players = sync_await(self._client_helper.get_online_players())
-        with self._table_lock:
-            # Filter out current user and store full player objects
-            filtered_players = [
-                player
-                for player in online_players
-                if player["username"] != self._current_username
-            ]
+    def _sync_with_roster(self):
+        """Đồng bộ toàn bộ bảng với roster store"""
+        # Filter out current user and store full player objects
+        filtered_players = [
+            player
+            for player in self._roster.players()
+            if player["username"] != self._current_username
+        ]
+
+        if self._model.rowCount() == 0:
+            self._model.reset_players(filtered_players)
+            return
 
-            self._table_content = {player["username"] for player in filtered_players}
+        for username in self._model.usernames():
+            if username not in self._roster:
+                self._model.remove_player(username)
 
-            # Sort by win rate descending, then by total score
-            sorted_players = sorted(
-                filtered_players,
-                key=lambda p: (p.get("winRate", 0), p.get("totalScore", 0)),
-                reverse=True,
-            )
+        for player in filtered_players:
+            self.update_player(player)
 
-            self._refresh_content(sorted_players)
+    def _on_roster_changed(self, change: RosterChange):
+        if change.reset:
+            self.reload()
+            return
 
-    def _on_new_player(self, player: dict):
-        # Refresh full list to get updated stats
-        self._init_content()
+        for username in change.removed:
+            self._model.remove_player(username)
 
-    def _on_player_offline(self, player: dict):
-        # Refresh full list to get updated stats
-        self._init_content()
+        self._model.update_players(
+            [
+                player
+                for player in change.updated
+                if player["username"] != self._current_username
+            ]
+        )
 
     def cleanup(self):
-        self._client_event_helper.remove_event(self._player_offline_event)
-        self._client_event_helper.remove_event(self._new_player_online_event)
+        self._roster.unsubscribe(self._roster_subscription)
 
 
 class MatchMakingView(QWidget):
-    new_challenge_signal: Any = pyqtSignal(dict)
     start_game_signal: Any = pyqtSignal(dict)
 
     def __init__(self, client: TCPClient, username: str):
         super().__init__()
+        self._created_at = time.perf_counter()
+        self._first_shown_at: float | None = None
+
         self._tcp_client = client
         self._username = username
         self._last_opponent = None  # Track opponent for game start
@@ -141,10 +192,16 @@ class MatchMakingView(QWidget):
         self.setWindowTitle("Người chơi online")
         self.resize(800, 500)
 
+        self._roster = get_roster_store(self._tcp_client)
+        self._roster.set_own_username(username)
+
         self._table = PlayerTable(
-            self._tcp_client, username, on_challenge_sent=self._on_challenge_sent
+            self._tcp_client,
+            username,
+            on_challenge_sent=self._on_challenge_sent,
+            page_size=LOBBY_PAGE_SIZE,
+            on_challenge_sending=self._on_challenge_sending,
         )
-        self._table.setEditTriggers(QTableWidget.NoEditTriggers)  # type: ignore
 
         # Stats panel for current user
         from PyQt5.QtCore import Qt
@@ -161,61 +218,196 @@ class MatchMakingView(QWidget):
         stats_layout.addWidget(self.stats_label)
         stats_group.setLayout(stats_layout)
 
+        # Lời thách đấu đến được xếp hàng, không chặn lobby bằng dialog modal
+        self._challenge_inbox = ChallengeInbox(self._tcp_client)
+        self._challenge_inbox.challenge_accepted.connect(self._on_challenge_accepted)
+
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 Tìm người chơi theo tên...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.textChanged.connect(self._table.set_search_prefix)
+
+        self.quick_match_button = QPushButton("⚡ Ghép trận nhanh")
+        self.quick_match_button.clicked.connect(self.toggle_quick_match)
+        self.quick_match_label = QLabel()
+
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.search_input)
+        search_layout.addWidget(self.quick_match_button)
+
         layout = QVBoxLayout()
         layout.addWidget(stats_group)
+        layout.addWidget(self._challenge_inbox)
+
+        # Ở chế độ phân trang store không có đủ người chơi để gợi ý/xếp hạng
+        self._suggestions = self._leaderboard = None
+        if not self._table.is_paged:
+            self._suggestions = OpponentSuggestions(self._roster, username)
+            self._suggestions.challenge_requested.connect(self._table.send_challenge)
+            self._leaderboard = LeaderboardPanel(self._roster)
+
+            panels_layout = QHBoxLayout()
+            panels_layout.addWidget(self._suggestions)
+            panels_layout.addWidget(self._leaderboard)
+            layout.addLayout(panels_layout)
+
+        layout.addLayout(search_layout)
+        layout.addWidget(self.quick_match_label)
         layout.addWidget(self._table)
         self.setLayout(layout)
 
         self._client_event_helper = ClientEventHelper(self._tcp_client)
         self._client_helper = ClientHelper(self._tcp_client)
 
-        # Update stats (after _client_helper is initialized)
-        self._update_user_stats()
-
-        self.new_challenge_signal.connect(self.on_new_challenge)
-        self.start_game_signal.connect(self.on_start_game)
+        self._quick_match = QuickMatch(
+            self._client_helper,
+            self._client_event_helper,
+            on_changed=self._update_quick_match_status,
+            challenge_timeout=QUICK_MATCH_CHALLENGE_TIMEOUT,
+            pending_expiry=QUICK_MATCH_PENDING_EXPIRY,
+        )
+        self._quick_match_task: asyncio.Task | None = None
 
-        self._on_received_challenge_event = (
-            self._client_event_helper.on_received_challenge(
-                lambda player: self.new_challenge_signal.emit(player)
-            )
+        # Trận từ lời thách đấu gửi tay hay từ inbox không được nhầm là trận
+        # của ghép trận nhanh
+        self._challenge_inbox.challenge_accepting.connect(
+            self._quick_match.note_other_challenge
         )
 
+        self._roster_subscription = self._roster.subscribe(self._on_roster_changed)
+
+        # Hiện cửa sổ ngay với trạng thái "Đang tải...", dữ liệu được điền sau
+        self._initial_load = asyncio.ensure_future(self._load_lobby())
+
+        self.start_game_signal.connect(self.on_start_game)
+
         self._on_start_game_event = self._client_event_helper.on_start_game(
             lambda body: self.start_game_signal.emit(body)
         )
 
-    def on_new_challenge(self, body: dict):
-        from_username, challenge_id = body["from"], body["challengeId"]
-        reply = QMessageBox.question(
-            self,
-            "Lời thách đấu",
-            f"Bạn nhận được lời thách đấu từ {from_username}!\nBạn có muốn chấp nhận?",
-            QMessageBox.Yes | QMessageBox.No,
-            QMessageBox.No,
-        )
-
-        new_status = "declined"
-        if reply == QMessageBox.Yes:
-            new_status = "accepted"
-            self._last_opponent = from_username  # Store for game start
-            self._is_challenger = False  # We are the receiver
+    def _on_challenge_accepted(self, from_username: str):
+        """Callback khi chấp nhận lời thách đấu trong inbox"""
+        self._last_opponent = from_username  # Store for game start
+        self._is_challenger = False  # We are the receiver
 
-        try:
-            sync_await(self._client_helper.answer_challenge(challenge_id, new_status))
-        except Exception as e:
-            print(f"Lỗi khi trả lời thách đấu: {e}")
-            QMessageBox.warning(self, "Lỗi", f"Không thể trả lời thách đấu: {e}")
+    def _on_challenge_sending(self, opponent: str):
+        """Callback ngay trước khi gửi challenge, dừng ghép trận nhanh"""
+        self._quick_match.note_other_challenge(opponent)
 
     def _on_challenge_sent(self, opponent: str):
         """Callback khi gửi challenge để lưu opponent info"""
         self._last_opponent = opponent
         self._is_challenger = True  # We sent the challenge
 
+    def _quick_match_candidates(self) -> list[str]:
+        if self._suggestions is not None:
+            return self._suggestions.candidates(QUICK_MATCH_CANDIDATES)
+
+        # Chế độ phân trang: lấy những người xếp hạng cao nhất đã tải
+        model = self._table.model()
+        return [
+            model.player_at(row)["username"]
+            for row in range(min(QUICK_MATCH_CANDIDATES, model.rowCount()))
+        ]
+
+    @asyncSlot()
+    async def toggle_quick_match(self):
+        """Bắt đầu ghép trận nhanh, hoặc huỷ nếu đang ghép"""
+        if self._quick_match_task is not None:
+            self._quick_match.cancel()
+            return
+
+        # Trận bắt đầu lúc này có thể là của một lời thách đấu còn hiệu lực
+        outstanding = self._quick_match.outstanding()
+        if outstanding:
+            self.quick_match_label.setText(
+                f"Đang chờ {', '.join(outstanding)} trả lời lời thách đấu trước"
+            )
+            return
+
+        candidates = self._quick_match_candidates()
+        if not candidates:
+            self.quick_match_label.setText("Không có người chơi nào để ghép trận")
+            return
+
+        self.quick_match_button.setText("✖ Huỷ ghép trận")
+        self._quick_match_task = asyncio.ensure_future(
+            self._quick_match.run(candidates, QUICK_MATCH_TIMEOUT)
+        )
+
+        try:
+            opponent = await self._quick_match_task
+        except Exception as e:
+            print(f"[ERROR] Quick match failed: {e}")
+            opponent = None
+        finally:
+            self._quick_match_task = None
+            self.quick_match_button.setText("⚡ Ghép trận nhanh")
+
+        left_pending = self._quick_match.left_pending
+        if opponent is None and left_pending:
+            self.quick_match_label.setText(
+                f"Đang chờ {', '.join(left_pending)} nhận lời thách đấu"
+            )
+        elif opponent is None:
+            self.quick_match_label.setText("Không ai nhận lời, hãy thử lại")
+        else:
+            self.quick_match_label.setText(f"Đã ghép trận với {opponent}")
+
+    def _update_quick_match_status(self):
+        if self._quick_match_task is None:
+            return
+
+        quick_match = self._quick_match
+        if not quick_match.fan_out:
+            usernames = list(quick_match.states)
+            current = quick_match.current
+            if current is not None:
+                self.quick_match_label.setText(
+                    f"Đang chờ {current} trả lời "
+                    f"({usernames.index(current) + 1}/{len(usernames)})..."
+                )
+            return
+
+        pending = quick_match.count("pending") + quick_match.count("sending")
+        self.quick_match_label.setText(
+            f"Đang chờ {pending}/{len(quick_match.states)} người chơi trả lời..."
+        )
+
     def on_start_game(self, body):
         from .dart_board_view import DartBoardView
 
         print(f"[DEBUG] startGame event received")
+
+        # startGame có thể đến trước response của lời chấp nhận trong inbox.
+        # Kiểm tra trước ghép trận nhanh: khi server không gửi challengeId,
+        # ghép trận nhanh chỉ đoán trận theo lời thách đấu duy nhất đang chờ
+        accepted_from = self._challenge_inbox.take_accepting()
+        resolved = None
+        if accepted_from is None:
+            resolved = self._quick_match.on_game_started(body)
+
+        if resolved is not None:
+            opponent, should_play = resolved
+            if not should_play:
+                # Trận thứ hai không được mở nhưng cũng không bị bỏ cuộc,
+                # chỉ xảy ra khi server không huỷ được lời thách đấu
+                self.quick_match_label.setText(
+                    f"{opponent} cũng đã nhận lời, trận này không được mở"
+                )
+                return
+
+            self._last_opponent = opponent
+            self._is_challenger = True
+        else:
+            # Một trận khác đã bắt đầu, dừng ghép trận nhanh nếu đang chạy
+            self._quick_match.cancel()
+
+            if accepted_from is not None:
+                self._on_challenge_accepted(accepted_from)
+
+            if self._last_opponent is not None:
+                self._quick_match.forget_other_challenge(self._last_opponent)
         print(f"[DEBUG] body = {body}, type = {type(body)}")
         print(f"[DEBUG] _last_opponent = {self._last_opponent}")
         print(f"[DEBUG] _is_challenger = {self._is_challenger}")
@@ -257,52 +449,93 @@ class MatchMakingView(QWidget):
         self._last_opponent = None
         self._is_challenger = False
 
+    def _on_roster_changed(self, change: RosterChange):
+        if change.reset or self._username in change.removed:
+            self._update_user_stats()
+            return
+
+        if any(player["username"] == self._username for player in change.updated):
+            self._update_user_stats()
+
     def _update_user_stats(self):
         """Cập nhật thống kê của user hiện tại"""
+        user_stats = self._roster.get(self._username)
+
+        if user_stats:
+            total_matches = user_stats.get("totalMatches", 0)
+            wins = user_stats.get("wins", 0)
+            losses = user_stats.get("losses", 0)
+            total_score = user_stats.get("totalScore", 0)
+            win_rate = user_stats.get("winRate", 0)
+
+            stats_text = (
+                f"🎯 Trận: {total_matches} | "
+                f"✅ Thắng: {wins} ({win_rate}%) | "
+                f"❌ Thua: {losses} | "
+                f"⭐ Tổng điểm: {total_score}"
+            )
+            self.stats_label.setText(stats_text)
+        else:
+            # User chưa có trong online list hoặc chưa chơi trận nào
+            self.stats_label.setText(
+                "🎯 Trận: 0 | ✅ Thắng: 0 (0%) | ❌ Thua: 0 | ⭐ Tổng điểm: 0"
+            )
+
+    @override
+    def showEvent(self, a0):
+        if self._first_shown_at is None:
+            self._first_shown_at = time.perf_counter()
+            print(
+                "[PERF] Lobby shown after "
+                f"{(self._first_shown_at - self._created_at) * 1000:.0f}ms"
+            )
+
+        super().showEvent(a0)
+
+    async def _load_lobby(self):
+        # Hiển thị ngay dữ liệu đã lưu từ lần trước, rồi đồng bộ với server
+        cached = await self._roster.load_cached(
+            {self._username} if self._table.is_paged else None
+        )
+        if cached:
+            print(
+                f"[PERF] {cached} cached players shown after "
+                f"{(time.perf_counter() - self._created_at) * 1000:.0f}ms"
+            )
+
+        await self._refresh_roster()
+
+        print(
+            "[PERF] Lobby interactive after "
+            f"{(time.perf_counter() - self._created_at) * 1000:.0f}ms"
+        )
+
+    async def _refresh_roster(self):
+        """Tải lại roster một lần cho cả bảng người chơi và thống kê"""
         try:
-            print(f"[DEBUG] Fetching online players for stats...")
-            online_players = sync_await(self._client_helper.get_online_players())
-            print(f"[DEBUG] Got {len(online_players)} players")
-
-            # Tìm stats của current user
-            user_stats = None
-            for player in online_players:
-                if player.get("username") == self._username:
-                    user_stats = player
-                    print(f"[DEBUG] Found current user stats: {user_stats}")
-                    break
-
-            if user_stats:
-                total_matches = user_stats.get("totalMatches", 0)
-                wins = user_stats.get("wins", 0)
-                losses = user_stats.get("losses", 0)
-                total_score = user_stats.get("totalScore", 0)
-                win_rate = user_stats.get("winRate", 0)
-
-                stats_text = (
-                    f"🎯 Trận: {total_matches} | "
-                    f"✅ Thắng: {wins} ({win_rate}%) | "
-                    f"❌ Thua: {losses} | "
-                    f"⭐ Tổng điểm: {total_score}"
-                )
-                print(f"[DEBUG] Setting stats text: {stats_text}")
-                self.stats_label.setText(stats_text)
-            else:
-                # User chưa có trong online list hoặc chưa chơi trận nào
-                print(
-                    f"[DEBUG] User {self._username} not found in online players, showing default"
-                )
-                self.stats_label.setText(
-                    "🎯 Trận: 0 | ✅ Thắng: 0 (0%) | ❌ Thua: 0 | ⭐ Tổng điểm: 0"
-                )
+            if not self._table.is_paged:
+                await self._roster.refresh()
+                return
+
+            # Bảng tự tải theo trang, chỉ cần lấy riêng stats của user hiện tại
+            self._table.reload()
+            players, _ = await self._client_helper.get_online_players_page(
+                0, 1, username=self._username
+            )
+            for player in players:
+                self._roster.update_player(player)
+
+            self._update_user_stats()
+
         except Exception as e:
             import traceback
 
-            print(f"[ERROR] Error loading user stats: {e}")
+            print(f"[ERROR] Error loading online players: {e}")
             print(traceback.format_exc())
             self.stats_label.setText(f"Lỗi tải thống kê: {str(e)[:50]}")
 
-    def _on_game_ended(self):
+    @asyncSlot()
+    async def _on_game_ended(self):
         """Xử lý khi game kết thúc - quay lại lobby"""
         print("[DEBUG] Game ended, returning to lobby")
         # Đóng game view
@@ -312,10 +545,14 @@ class MatchMakingView(QWidget):
         # Hiển thị lại lobby
         self.show()
         # Refresh danh sách người chơi và stats
-        self._table._init_content()
-        self._update_user_stats()
+        self._roster.invalidate()
+        await self._refresh_roster()
 
     def cleanup(self):
+        self._roster.unsubscribe(self._roster_subscription)
         self._table.cleanup()
-        self._client_event_helper.remove_event(self._on_received_challenge_event)
+        self._challenge_inbox.cleanup()
+        if self._suggestions is not None:
+            self._suggestions.cleanup()
+            self._leaderboard.cleanup()
         self._client_event_helper.remove_event(self._on_start_game_event)
@@ -0,0 +1,105 @@
+from typing import Any
+
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QGroupBox,
+    QHBoxLayout,
+    QLabel,
+    QListWidget,
+    QListWidgetItem,
+    QPushButton,
+    QVBoxLayout,
+)
+from utils.roster_store import RosterChange, RosterStore
+from utils.skill_index import SkillIndex, skill_of
+
+
+class OpponentSuggestions(QGroupBox):
+    """
+    Gợi ý k người chơi online có trình độ gần user hiện tại nhất.
+
+    Index skill được cập nhật theo từng thay đổi của roster store nên danh sách
+    gợi ý luôn mới mà không phải quét lại cả lobby.
+    """
+
+    # Username của người chơi được chọn để thách đấu
+    challenge_requested: Any = pyqtSignal(str)
+
+    def __init__(self, roster: RosterStore, username: str, k: int = 5):
+        super().__init__("🎯 Đối thủ cân sức")
+
+        self._roster = roster
+        self._username = username
+        self._k = k
+
+        self._index = SkillIndex(roster.players())
+
+        self._list = QListWidget()
+        self._list.itemDoubleClicked.connect(self._challenge_item)
+
+        challenge_button = QPushButton("Thách đấu")
+        challenge_button.clicked.connect(
+            lambda: self._challenge_item(self._list.currentItem())
+        )
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(challenge_button)
+
+        self._empty_label = QLabel("Chưa có người chơi nào khác online")
+        self._empty_label.setAlignment(Qt.AlignCenter)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self._list)
+        layout.addWidget(self._empty_label)
+        layout.addLayout(buttons_layout)
+        self.setLayout(layout)
+
+        self._roster_subscription = roster.subscribe(self._on_roster_changed)
+        self._refresh_suggestions()
+
+    def _own_skill(self) -> float:
+        own = self._roster.get(self._username)
+        return skill_of(own if own is not None else {})
+
+    def candidates(self, k: int) -> list[str]:
+        """k người chơi có trình độ gần user hiện tại nhất"""
+        suggestions = self._index.nearest(self._own_skill(), k, exclude=self._username)
+        return [username for username, _ in suggestions]
+
+    def _refresh_suggestions(self):
+        suggestions = self._index.nearest(
+            self._own_skill(), self._k, exclude=self._username
+        )
+
+        self._list.clear()
+        for username, _ in suggestions:
+            player = self._roster.get(username) or {"username": username}
+
+            item = QListWidgetItem(
+                f"{username} — {player.get('winRate', 0)}% thắng, "
+                f"{player.get('totalMatches', 0)} trận"
+            )
+            item.setData(Qt.UserRole, username)
+            self._list.addItem(item)
+
+        self._list.setVisible(bool(suggestions))
+        self._empty_label.setVisible(not suggestions)
+
+    def _on_roster_changed(self, change: RosterChange):
+        if change.reset:
+            self._index = SkillIndex(self._roster.players())
+        else:
+            for username in change.removed:
+                self._index.remove(username)
+
+            self._index.update_many(change.updated)
+
+        self._refresh_suggestions()
+
+    def _challenge_item(self, item: QListWidgetItem | None):
+        if item is not None:
+            self.challenge_requested.emit(item.data(Qt.UserRole))
+
+    def cleanup(self):
+        self._roster.unsubscribe(self._roster_subscription)
@@ -0,0 +1,435 @@
+import asyncio
+from bisect import bisect_left, insort
+from typing import Any
+
+from PyQt5.QtCore import (
+    QAbstractTableModel,
+    QEvent,
+    QModelIndex,
+    QPersistentModelIndex,
+    Qt,
+    pyqtSignal,
+)
+from PyQt5.QtWidgets import (
+    QApplication,
+    QStyle,
+    QStyledItemDelegate,
+    QStyleOptionButton,
+)
+from utils.client_helper import ClientHelper
+from utils.roster_index import PrefixIndex
+from utils.roster_store import has_stats
+
+HEADERS = ["Tên", "Trận", "Thắng", "Thua", "Điểm", "Thách đấu"]
+CHALLENGE_COLUMN = 5
+
+
+def rank_key(player: dict) -> tuple:
+    # Sort by win rate descending, then by total score
+    return (
+        -player.get("winRate", 0),
+        -player.get("totalScore", 0),
+        player["username"],
+    )
+
+
+def _cell_text(player: dict, column: int) -> str | None:
+    if 1 <= column < CHALLENGE_COLUMN and not has_stats(player):
+        # Stats đang được tải, không hiện số 0 gây hiểu nhầm
+        return "…"
+
+    match column:
+        case 0:
+            return player["username"]
+        case 1:
+            return str(player.get("totalMatches", 0))
+        case 2:
+            return f"{player.get('wins', 0)} ({player.get('winRate', 0)}%)"
+        case 3:
+            return str(player.get("losses", 0))
+        case 4:
+            return str(player.get("totalScore", 0))
+
+    return None
+
+
+class PlayerTableModel(QAbstractTableModel):
+    """
+    Model danh sách người chơi, luôn giữ thứ tự theo `rank_key`.
+
+    Thêm/xoá/cập nhật một người chơi chỉ báo cho view đúng dòng bị ảnh hưởng,
+    view chỉ vẽ các dòng đang hiển thị. Có thể lọc theo tiền tố username qua
+    `set_prefix`, các dòng hiển thị vẫn giữ thứ tự xếp hạng.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        # Toàn bộ người chơi và rank key của họ theo thứ tự xếp hạng
+        self._players: dict[str, dict] = {}
+        self._all_keys: list[tuple] = []
+        self._prefix_index = PrefixIndex()
+        self._prefix = ""
+
+        # Các dòng đang hiển thị (khớp với bộ lọc)
+        self._rows: list[dict] = []
+        self._row_keys: list[tuple] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+
+        if role == Qt.DisplayRole:
+            return _cell_text(self._rows[index.row()], index.column())
+
+        if role == Qt.TextAlignmentRole and 1 <= index.column() <= 4:
+            return Qt.AlignCenter
+
+        return None
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+
+        return super().headerData(section, orientation, role)
+
+    def player_at(self, row: int) -> dict:
+        return self._rows[row]
+
+    def get(self, username: str) -> dict | None:
+        return self._players.get(username)
+
+    def usernames(self) -> list[str]:
+        return list(self._players)
+
+    def _matches(self, username: str) -> bool:
+        return username.casefold().startswith(self._prefix)
+
+    def _filtered_keys(self) -> list[tuple]:
+        if not self._prefix:
+            return list(self._all_keys)
+
+        return sorted(
+            rank_key(self._players[username])
+            for username in self._prefix_index.search(self._prefix)
+        )
+
+    def _reset_rows(self):
+        self.beginResetModel()
+
+        self._row_keys = self._filtered_keys()
+        self._rows = [self._players[key[-1]] for key in self._row_keys]
+
+        self.endResetModel()
+
+    def set_prefix(self, prefix: str):
+        """Chỉ hiển thị người chơi có username bắt đầu bằng `prefix`"""
+        prefix = prefix.strip().casefold()
+        if prefix == self._prefix:
+            return
+
+        self._prefix = prefix
+        self._reset_rows()
+
+    def reset_players(self, players: list[dict]):
+        """Thay toàn bộ dữ liệu, dùng cho lần tải đầu tiên"""
+        self._players = {player["username"]: player for player in players}
+        self._all_keys = sorted(rank_key(player) for player in players)
+        self._prefix_index = PrefixIndex(self._players)
+
+        self._reset_rows()
+
+    def _append_sorted(self, players: list[dict]):
+        """Thêm một khối người chơi đã sắp xếp, xếp hạng sau mọi người chơi hiện có"""
+        for player in players:
+            self._players[player["username"]] = player
+            self._all_keys.append(rank_key(player))
+            self._prefix_index.add(player["username"])
+
+        visible = [player for player in players if self._matches(player["username"])]
+        if not visible:
+            return
+
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(visible) - 1)
+        for player in visible:
+            self._rows.append(player)
+            self._row_keys.append(rank_key(player))
+        self.endInsertRows()
+
+    def _add_new_players(self, players: list[dict]):
+        """Thêm các người chơi chưa có trong model"""
+        players = sorted(players, key=rank_key)
+
+        # Phần lớn khối nằm sau người chơi cuối cùng: thêm cả khối một lần
+        tail_start = len(players)
+        while tail_start > 0 and (
+            not self._all_keys or rank_key(players[tail_start - 1]) >= self._all_keys[-1]
+        ):
+            tail_start -= 1
+
+        for player in players[:tail_start]:
+            self._insert(player)
+
+        self._append_sorted(players[tail_start:])
+
+    def _insert(self, player: dict):
+        key = rank_key(player)
+        username = player["username"]
+
+        self._players[username] = player
+        insort(self._all_keys, key)
+        self._prefix_index.add(username)
+
+        if not self._matches(username):
+            return
+
+        row = bisect_left(self._row_keys, key)
+
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._rows.insert(row, player)
+        self._row_keys.insert(row, key)
+        self.endInsertRows()
+
+    def remove_player(self, username: str) -> dict | None:
+        player = self._players.pop(username, None)
+        if player is None:
+            return None
+
+        key = rank_key(player)
+        del self._all_keys[bisect_left(self._all_keys, key)]
+        self._prefix_index.remove(username)
+
+        if not self._matches(username):
+            return player
+
+        row = bisect_left(self._row_keys, key)
+
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._rows[row]
+        del self._row_keys[row]
+        self.endRemoveRows()
+
+        return player
+
+    def update_players(self, players: list[dict]):
+        """Thêm hoặc cập nhật một lô người chơi"""
+        new_players = []
+
+        for player in players:
+            if player["username"] in self._players:
+                self.update_player(player)
+            else:
+                new_players.append(player)
+
+        self._add_new_players(new_players)
+
+    def update_player(self, player: dict):
+        """Thêm hoặc cập nhật một người chơi"""
+        username = player["username"]
+
+        old = self._players.get(username)
+        if old is None:
+            self._insert(player)
+            return
+
+        if rank_key(old) != rank_key(player):
+            # Thứ hạng thay đổi: chuyển dòng sang vị trí mới
+            self.remove_player(username)
+            self._insert(player)
+            return
+
+        self._players[username] = player
+        if not self._matches(username):
+            return
+
+        row = bisect_left(self._row_keys, rank_key(player))
+        self._rows[row] = player
+
+        changed = [
+            column
+            for column in range(1, CHALLENGE_COLUMN)
+            if _cell_text(old, column) != _cell_text(player, column)
+        ]
+        if changed:
+            self.dataChanged.emit(
+                self.index(row, min(changed)), self.index(row, max(changed))
+            )
+
+
+class PagedPlayerTableModel(PlayerTableModel):
+    """
+    Model chỉ tải danh sách người chơi theo từng trang.
+
+    View gọi `fetchMore` khi cuộn gần cuối để tải trang kế tiếp. Vùng đã tải
+    là mọi người chơi xếp hạng trên hoặc bằng con trỏ (rank key của dòng cuối
+    đã tải) và được event presence giữ đồng bộ; event của người chơi nằm sau
+    con trỏ được bỏ qua, họ sẽ xuất hiện khi trang chứa họ được tải. Bộ lọc
+    tiền tố chỉ áp dụng trên các trang đã tải.
+    """
+
+    def __init__(
+        self,
+        client_helper: ClientHelper,
+        own_username: str,
+        page_size: int,
+        parent=None,
+    ):
+        super().__init__(parent)
+
+        self._client_helper = client_helper
+        self._own_username = own_username
+        self._page_size = page_size
+
+        # Rank key của dòng cuối cùng đã tải (kể cả user hiện tại)
+        self._cursor: tuple | None = None
+        # User hiện tại không có trong model nhưng vẫn chiếm một dòng trên server
+        self._own_loaded = False
+        self._total: int | None = None
+
+        self._loading: asyncio.Task | None = None
+        self._generation = 0
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
+
+    def _next_offset(self) -> int:
+        """
+        Vị trí trang kế tiếp trong danh sách của server, tính từ vùng đã tải
+        thay vì cộng dồn số dòng đã nhận, nên không bị lệch (bỏ sót hoặc lặp
+        người chơi) khi có người online/offline giữa hai lần tải trang.
+        """
+        return len(self._players) + self._own_loaded
+
+    def _has_more(self) -> bool:
+        return self._total is None or self._next_offset() < self._total
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loading is None and self._has_more()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+
+        self._loading = asyncio.ensure_future(self._load_page(self._generation))
+
+    def reload(self):
+        """Bỏ các trang đã tải và tải lại từ đầu"""
+        self._generation += 1
+        if self._loading is not None:
+            self._loading.cancel()
+            self._loading = None
+
+        self.reset_players([])
+        self._cursor = None
+        self._own_loaded = False
+        self._total = None
+
+        self.fetchMore()
+
+    async def _load_page(self, generation: int):
+        offset = self._next_offset()
+        try:
+            players, total = await self._client_helper.get_online_players_page(
+                offset, self._page_size
+            )
+        except Exception as e:
+            print(f"[ERROR] Error loading players page: {e}")
+            return
+        finally:
+            if generation == self._generation:
+                self._loading = None
+
+        if generation != self._generation:
+            return
+
+        # Trang rỗng: đã hết danh sách dù total có thể đã cũ
+        self._total = total if players else offset
+        if not players:
+            return
+
+        last_key = rank_key(players[-1])
+        if self._cursor is None or last_key > self._cursor:
+            self._cursor = last_key
+
+        if any(player["username"] == self._own_username for player in players):
+            self._own_loaded = True
+
+        self._add_new_players(
+            [
+                player
+                for player in players
+                if player["username"] != self._own_username
+                and player["username"] not in self._players
+            ]
+        )
+
+    def update_players(self, players: list[dict]):
+        for player in players:
+            self.update_player(player)
+
+    def update_player(self, player: dict):
+        is_loaded = player["username"] in self._players
+        is_beyond_loaded = self._has_more() and (
+            self._cursor is None or rank_key(player) > self._cursor
+        )
+
+        if is_beyond_loaded:
+            if is_loaded:
+                self.remove_player(player["username"])
+            return
+
+        super().update_player(player)
+
+
+class ChallengeButtonDelegate(QStyledItemDelegate):
+    """
+    Vẽ nút "Thách đấu" thay vì tạo QPushButton thật cho mỗi dòng.
+    """
+
+    clicked: Any = pyqtSignal(QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = QPersistentModelIndex()
+
+    def paint(self, painter, option, index):
+        button = QStyleOptionButton()
+        button.rect = option.rect.adjusted(4, 2, -4, -2)
+        button.text = "Thách đấu"
+        button.state = QStyle.State_Enabled
+
+        if option.state & QStyle.State_MouseOver:
+            button.state |= QStyle.State_MouseOver
+
+        if self._pressed.isValid() and QModelIndex(self._pressed) == index:
+            button.state |= QStyle.State_Sunken
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() == QEvent.MouseButtonPress:
+            if event.button() != Qt.LeftButton:
+                return False
+
+            self._pressed = QPersistentModelIndex(index)
+            return True
+
+        if event.type() == QEvent.MouseButtonRelease:
+            was_pressed = self._pressed.isValid() and QModelIndex(self._pressed) == index
+            self._pressed = QPersistentModelIndex()
+
+            if was_pressed and option.rect.contains(event.pos()):
+                self.clicked.emit(index)
+
+            return True
+
+        return False
@@ -14,6 +14,7 @@ from PyQt5.QtWidgets import (
 from qasync import asyncSlot
 from utils.client_helper import ClientHelper
 from utils.tcp_client import TCPClient
+from utils.username_availability import UsernameAvailability
 from utils.validators import (
     translate_error_message,
     validate_password,
@@ -33,6 +34,46 @@ class RegisterView(QWidget):
 
         self._client_helper = ClientHelper(client)
 
+        self._availability = UsernameAvailability(self._client_helper)
+        self.input_username.textChanged.connect(self._on_username_changed)
+
+    def _set_username_status(self, text: str, color: str = "white"):
+        self.label_username_status.setText(text)
+        self.label_username_status.setStyleSheet(f"color: {color}; font-size: 12px;")
+
+    def _on_username_changed(self, text: str):
+        username = text.strip()
+        if not username:
+            self._availability.cancel()
+            self._set_username_status("")
+            return
+
+        # Luật cục bộ được kiểm tra ngay, không cần hỏi server
+        is_valid, error_msg = validate_username(username)
+        if not is_valid:
+            self._availability.cancel()
+            self._set_username_status(error_msg, "#ff8a80")
+            return
+
+        if self._availability.supported:
+            self._set_username_status("Đang kiểm tra...")
+        else:
+            self._set_username_status("")
+
+        self._availability.check(username, self._show_availability)
+
+    def _show_availability(self, username: str, available: bool | None):
+        # Bỏ qua kết quả của username cũ
+        if username != self.input_username.text().strip():
+            return
+
+        if available is None:
+            self._set_username_status("")
+        elif available:
+            self._set_username_status("✔ Username có thể sử dụng", "#b9f6ca")
+        else:
+            self._set_username_status("✖ Username đã có người dùng", "#ff8a80")
+
     @asyncSlot()
     async def handle_register(self):
         username = self.input_username.text().strip()
@@ -46,6 +87,13 @@ class RegisterView(QWidget):
             self.input_username.setFocus()
             return
 
+        if self._availability.cached(username) is False:
+            QMessageBox.warning(
+                self, "Lỗi", translate_error_message("Username already exists")
+            )
+            self.input_username.setFocus()
+            return
+
         is_valid, error_msg = validate_password(password)
         if not is_valid:
             QMessageBox.warning(self, "Lỗi", error_msg)
@@ -74,6 +122,8 @@ class RegisterView(QWidget):
                 password=password,
             )
 
+            self._availability.remember(username, False)
+
             QMessageBox.information(
                 self,
                 "Thành công",
@@ -84,6 +134,9 @@ class RegisterView(QWidget):
             self.go_to_login.emit()
 
         except ValueError as e:
+            if "already exists" in str(e).lower():
+                self._availability.remember(username, False)
+
             error_message = translate_error_message(str(e))
             QMessageBox.warning(self, "Đăng ký thất bại", error_message)
             self.input_password.clear()
@@ -117,6 +170,7 @@ class RegisterView(QWidget):
         self.input_username = QLineEdit()
         self.input_username.setPlaceholderText("Nhập username (3-20 ký tự)")
         self.input_username.setFixedHeight(40)
+        self.label_username_status = QLabel()
 
         self.label_password = QLabel("Password:")
         self.input_password = QLineEdit()
@@ -150,6 +204,7 @@ class RegisterView(QWidget):
         username_row.addWidget(self.label_username)
         username_row.addWidget(self.input_username)
         layout.addLayout(username_row)
+        layout.addWidget(self.label_username_status, alignment=Qt.AlignRight)
 
         password_row = QHBoxLayout()
         password_row.addWidget(self.label_password)
@@ -175,7 +230,7 @@ class RegisterView(QWidget):
         layout.addLayout(login_row)
 
         self.container_width = 400
-        self.container_height = 300
+        self.container_height = 330
         self.container = QWidget(self)
         self.container.setLayout(layout)
         self.container.setObjectName("registerContainer")